@@ -0,0 +1,74 @@
+"""
+Benchmarks of duckboat's overhead relative to raw DuckDB.
+
+    just bench            # run, and save the results under .benchmarks/
+    just bench-compare    # run, and compare against the last saved run
+
+Each group pairs a duckboat operation with the equivalent raw DuckDB call,
+so the difference is what duckboat adds. The data is synthetic, generated
+from a fixed seed. Needs pytest-benchmark, from the dev dependency group.
+"""
+import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+ROWS = 1_000_000
+
+
+def make_frame(n, seed=0):
+    """
+    A DataFrame of `n` rows with integer, float, and string columns.
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'id': np.arange(n),
+        'key': rng.integers(0, 1_000, n),
+        'value': rng.random(n),
+        'name': rng.choice(['alpha', 'beta', 'gamma', 'delta'], n),
+    })
+
+
+@pytest.fixture(scope='session')
+def raw_con():
+    return duckdb.connect()
+
+
+@pytest.fixture(scope='session')
+def frame():
+    return make_frame(ROWS)
+
+
+@pytest.fixture(scope='session')
+def small_frame():
+    return make_frame(100)
+
+
+@pytest.fixture(scope='session')
+def arrow_table(frame):
+    return pa.Table.from_pandas(frame, preserve_index=False)
+
+
+@pytest.fixture(scope='session')
+def polars_frame(arrow_table):
+    pl = pytest.importorskip('polars')
+    return pl.from_arrow(arrow_table)
+
+
+@pytest.fixture(scope='session')
+def parquet_file(tmp_path_factory, arrow_table):
+    import pyarrow.parquet as pq
+
+    path = tmp_path_factory.mktemp('data') / 'data.parquet'
+    pq.write_table(arrow_table, path)
+    return str(path)
+
+
+@pytest.fixture(scope='session')
+def csv_file(tmp_path_factory, arrow_table):
+    import pyarrow.csv as pc
+
+    path = tmp_path_factory.mktemp('data') / 'data.csv'
+    pc.write_csv(arrow_table, path)
+    return str(path)
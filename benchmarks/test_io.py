@@ -0,0 +1,110 @@
+"""
+Moving data in and out: ingestion from pandas, Polars, and Arrow,
+extraction into Python objects, and saving to files.
+"""
+import duckboat as uck
+import pytest
+
+
+def _count(x):
+    return uck.do(x, 'select count(*)', int)
+
+
+@pytest.mark.benchmark(group='ingest')
+def test_ingest_pandas_raw(benchmark, raw_con, frame):
+    def run():
+        df = frame  # noqa: F841  (found by DuckDB's replacement scan)
+        return raw_con.sql('select count(*) from df').fetchone()
+
+    benchmark(run)
+
+
+@pytest.mark.benchmark(group='ingest')
+def test_ingest_pandas(benchmark, frame):
+    benchmark(_count, frame)
+
+
+@pytest.mark.benchmark(group='requery pandas')
+def test_requery_pandas_raw(benchmark, raw_con, frame):
+    df = frame  # noqa: F841  (found by DuckDB's replacement scan)
+    rel = raw_con.sql('from df')
+    benchmark(lambda: rel.aggregate('name, count(*)').fetchall())
+
+
+@pytest.mark.benchmark(group='requery pandas')
+def test_requery_pandas(benchmark, frame):
+    t = uck.Table(frame)
+    benchmark(t.do, 'select name, count(*) group by 1', 'arrow')
+
+
+@pytest.mark.benchmark(group='ingest')
+def test_ingest_polars(benchmark, polars_frame):
+    benchmark(_count, polars_frame)
+
+
+@pytest.mark.benchmark(group='ingest')
+def test_ingest_arrow(benchmark, arrow_table):
+    benchmark(_count, arrow_table)
+
+
+@pytest.mark.benchmark(group='ingest')
+def test_ingest_parquet(benchmark, parquet_file):
+    benchmark(_count, parquet_file)
+
+
+CSV_COLUMNS = {'id': 'BIGINT', 'key': 'BIGINT', 'value': 'DOUBLE', 'name': 'VARCHAR'}
+
+
+@pytest.mark.benchmark(group='ingest csv')
+def test_ingest_csv_sniffed(benchmark, csv_file):
+    benchmark(lambda: uck.Table(csv_file).columns)
+
+
+@pytest.mark.benchmark(group='ingest csv')
+def test_ingest_csv_declared(benchmark, csv_file):
+    benchmark(lambda: uck.Table(csv_file, columns=CSV_COLUMNS).columns)
+
+
+@pytest.mark.benchmark(group='extract scalar')
+def test_extract_int_raw(benchmark, raw_con, arrow_table):
+    rel = raw_con.sql('select max(id) from arrow_table')
+    benchmark(lambda: rel.fetchall()[0][0])
+
+
+@pytest.mark.benchmark(group='extract scalar')
+def test_extract_int(benchmark, arrow_table):
+    t = uck.do(arrow_table, 'select max(id)')
+    benchmark(t.do, int)
+
+
+@pytest.mark.benchmark(group='extract scalar')
+def test_extract_dict(benchmark, arrow_table):
+    t = uck.do(arrow_table, 'select max(id) as id, max(value) as value')
+    benchmark(t.do, dict)
+
+
+@pytest.mark.benchmark(group='extract column')
+def test_extract_list_raw(benchmark, raw_con, arrow_table):
+    rel = raw_con.sql('select value from arrow_table')
+    benchmark(lambda: rel.to_arrow_table().column(0).to_pylist())
+
+
+@pytest.mark.benchmark(group='extract column')
+def test_extract_list(benchmark, arrow_table):
+    t = uck.do(arrow_table, 'select value')
+    benchmark(t.do, list)
+
+
+@pytest.mark.parametrize('ext', ['parquet', 'csv'])
+@pytest.mark.benchmark(group='save')
+def test_save_raw(benchmark, raw_con, arrow_table, tmp_path, ext):
+    rel = raw_con.sql('from arrow_table')
+    write = rel.write_parquet if ext == 'parquet' else rel.write_csv
+    benchmark(write, str(tmp_path / f'out.{ext}'))
+
+
+@pytest.mark.parametrize('ext', ['parquet', 'csv'])
+@pytest.mark.benchmark(group='save')
+def test_save(benchmark, arrow_table, tmp_path, ext):
+    t = uck.Table(arrow_table)
+    benchmark(t.save, str(tmp_path / f'out.{ext}'))
@@ -0,0 +1,106 @@
+"""
+Per-query overhead: binding small queries, chains of SQL steps,
+and reading tables from Python objects and files.
+"""
+import duckboat as uck
+import pytest
+
+FILTERS = [f'key != {i}' for i in range(40)]
+STEPS = ['where ' + f for f in FILTERS]
+
+
+@pytest.mark.benchmark(group='small query')
+def test_small_query_raw(benchmark, raw_con):
+    benchmark(lambda: raw_con.sql('select 42').fetchone())
+
+
+@pytest.mark.benchmark(group='small query')
+def test_small_query_duckboat(benchmark):
+    benchmark(lambda: uck.query('select 42').fetchone())
+
+
+@pytest.mark.benchmark(group='small query')
+def test_small_query_do(benchmark, small_frame):
+    t = uck.Table(small_frame)
+    benchmark(lambda: t.do('select 42', int))
+
+
+@pytest.mark.benchmark(group='named table')
+def test_named_table_raw(benchmark, raw_con, small_frame):
+    def run():
+        df = small_frame  # noqa: F841  (found by DuckDB's replacement scan)
+        return raw_con.sql('select count(*) from df').fetchone()
+
+    benchmark(run)
+
+
+@pytest.mark.benchmark(group='named table')
+def test_named_table_duckboat(benchmark, small_frame):
+    benchmark(lambda: uck.query('select count(*) from df', df=small_frame).fetchone())
+
+
+@pytest.mark.parametrize('length', [1, 10, 40])
+@pytest.mark.benchmark(group='chain')
+def test_chain_raw(benchmark, raw_con, small_frame, length):
+    def run():
+        df = small_frame  # noqa: F841  (found by DuckDB's replacement scan)
+        rel = raw_con.sql('select * from df')
+        for f in FILTERS[:length]:
+            rel = rel.filter(f)
+        return rel
+
+    benchmark(run)
+
+
+@pytest.mark.parametrize('length', [1, 10, 40])
+@pytest.mark.benchmark(group='chain')
+def test_chain_duckboat(benchmark, small_frame, length):
+    t = uck.Table(small_frame)
+    benchmark(lambda: t.do(*STEPS[:length]))
+
+
+@pytest.mark.parametrize('length', [1, 10, 40])
+@pytest.mark.benchmark(group='chain')
+def test_chain_deferred(benchmark, small_frame, length):
+    t = uck.Table(small_frame)
+    uck.options.defer_binding = True
+    try:
+        benchmark(lambda: t.do(*STEPS[:length]).rel)
+    finally:
+        uck.options.defer_binding = False
+
+
+PARAM_STEPS = [f'where key != $k{i}' for i in range(10)]
+PARAMS = {f'k{i}': i for i in range(10)}
+
+
+@pytest.mark.benchmark(group='rerun with new values')
+def test_rerun_do(benchmark, small_frame):
+    t = uck.Table(small_frame)
+
+    def run():
+        steps = [f'where key != {v}' for v in PARAMS.values()]
+        return t.do(*steps, 'select count(*)', int)
+
+    benchmark(run)
+
+
+@pytest.mark.benchmark(group='rerun with new values')
+def test_rerun_pipeline(benchmark, small_frame):
+    p = uck.pipeline(small_frame, *PARAM_STEPS, 'select count(*)', int)
+    benchmark(lambda: p(**PARAMS))
+
+
+@pytest.mark.benchmark(group='form_relation')
+def test_form_relation_frame(benchmark, small_frame):
+    benchmark(uck.Table, small_frame)
+
+
+@pytest.mark.benchmark(group='form_relation')
+def test_form_relation_parquet(benchmark, parquet_file):
+    benchmark(uck.Table, parquet_file)
+
+
+@pytest.mark.benchmark(group='form_relation')
+def test_form_relation_parquet_raw(benchmark, raw_con, parquet_file):
+    benchmark(raw_con.read_parquet, parquet_file)
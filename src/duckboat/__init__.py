@@ -1,4 +1,16 @@
-from .ddb import query, con
+from .ddb import (
+    query, connect, configure, load_extension, register_extension, cancel_scope,
+)
 from .table import Table
 from .mixin_do import _do as do, rename
-from . import examples
+from ._options import options
+from ._profile import profile
+from ._pipeline import pipeline
+from ._async import ado
+from . import ddb, examples
+
+
+def __getattr__(name):
+    if name == 'con':
+        return ddb.con
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
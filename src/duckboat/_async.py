@@ -0,0 +1,94 @@
+"""
+Running do() chains and materializing tables without blocking an
+asyncio event loop.
+
+The work runs on a pool of worker threads, each with its own connection
+(see `ddb.get_con()`), so concurrent awaits run in parallel. Tables made on
+other threads are bound again on the worker's connection, so that's where
+all of the job's queries run. If the awaiting task is cancelled, or its
+timeout passes, the worker's cancel scope is cancelled, which interrupts
+that connection alone.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from .ddb import CancelScope
+
+_lock = threading.Lock()
+_executor = None
+
+
+def _get_executor():
+    global _executor
+
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(thread_name_prefix='duckboat')
+        return _executor
+
+
+class _Job:
+    """
+    A function run on a worker thread, in a cancel scope.
+    """
+    __slots__ = ('f', 'args', 'scope', 'cancelled', 'lock')
+
+    def __init__(self, f, args):
+        self.f = f
+        self.args = args
+        self.scope = None
+        self.cancelled = False
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with CancelScope() as scope:
+            with self.lock:
+                if self.cancelled:
+                    raise asyncio.CancelledError
+                self.scope = scope
+            return self.f(*self.args)
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled = True
+            scope = self.scope
+        if scope is not None:
+            scope.cancel()
+
+
+def _stop(job, fut):
+    # The caller has moved on, so the worker's error is nobody's to see.
+    fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+    job.cancel()
+
+
+async def run(f, *args, timeout=None):
+    """
+    Await `f(*args)`, run on a worker thread. On cancellation or timeout,
+    the worker's query is interrupted.
+    """
+    loop = asyncio.get_running_loop()
+    job = _Job(f, args)
+    fut = loop.run_in_executor(_get_executor(), job)
+    try:
+        return await asyncio.wait_for(asyncio.shield(fut), timeout)
+    except asyncio.TimeoutError:
+        _stop(job, fut)
+        raise TimeoutError(f'Query timed out after {timeout}s') from None
+    except asyncio.CancelledError:
+        _stop(job, fut)
+        raise
+
+
+async def ado(A, *xs, timeout=None):
+    """
+    `do(A, *xs)`, awaited without blocking the event loop.
+
+    End the chain with an output, like 'arrow', 'pandas', or `int`, to
+    compute the result on the worker; a lazy Table is otherwise computed
+    when it's later used. The query is interrupted if the awaiting task is
+    cancelled, or after `timeout` seconds, raising TimeoutError.
+    """
+    from .mixin_do import _do
+    return await run(_do, A, *xs, timeout=timeout)
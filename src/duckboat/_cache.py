@@ -0,0 +1,60 @@
+"""
+An in-memory LRU cache of query results, as Arrow tables.
+
+Entries are keyed by a table's SQL plus the identities of the tables it
+reads from, and hold references to those tables so that their ids can't
+be reused while the entry is alive. The total size of the cached results
+is bounded by `options.cache_size` bytes.
+"""
+from collections import OrderedDict
+import threading
+
+from ._options import options
+
+_lock = threading.Lock()
+_entries = OrderedDict()  # key -> (arrow table, pinned inputs)
+_nbytes = 0
+
+
+def get(key):
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return None
+        _entries.move_to_end(key)
+        return entry[0]
+
+
+def put(key, data, pin=()):
+    global _nbytes
+
+    with _lock:
+        if key in _entries:
+            _nbytes -= _entries.pop(key)[0].nbytes
+        if data.nbytes > options.cache_size:
+            return
+        _entries[key] = (data, pin)
+        _nbytes += data.nbytes
+        while _nbytes > options.cache_size:
+            _, (old, _) = _entries.popitem(last=False)
+            _nbytes -= old.nbytes
+
+
+def discard(key):
+    global _nbytes
+
+    with _lock:
+        if key in _entries:
+            _nbytes -= _entries.pop(key)[0].nbytes
+
+
+def clear():
+    global _nbytes
+
+    with _lock:
+        _entries.clear()
+        _nbytes = 0
+
+
+def nbytes():
+    return _nbytes
@@ -0,0 +1,69 @@
+class _Options:
+    """
+    Library-wide settings. Change them by assigning attributes:
+
+        uck.options.defer_binding = True
+    """
+    __slots__ = (
+        'defer_binding',
+        'cache_results',
+        'cache_size',
+        'preview_rows',
+        'preview_sample',
+        'preview_timeout',
+        'query_timeout',
+        'remote_cache',
+        'remote_cache_dir',
+        'remote_cache_size',
+        'pandas_to_arrow',
+    )
+
+    def __init__(self):
+        # Compose consecutive SQL steps in a do() chain into one query,
+        # bound when the result is first used, instead of binding each step.
+        self.defer_binding = False
+
+        # Keep the results of materialized tables (repr, df(), arrow(), ...)
+        # in memory, keyed by SQL and inputs, and reuse them on repeat.
+        self.cache_results = False
+
+        # Upper bound, in bytes, on the size of cached results.
+        self.cache_size = 2**30
+
+        # repr() shows at most this many rows, computing no more than that
+        # where the query allows. None shows DuckDB's full display.
+        self.preview_rows = 20
+
+        # Preview a random sample of rows rather than the first ones.
+        # Sampling reads the whole input, within the time budget below.
+        self.preview_sample = False
+
+        # Seconds repr() may spend running a query before giving up.
+        # None waits as long as it takes.
+        self.preview_timeout = 0.5
+
+        # Seconds a do() chain or a computation like df() or save() may run
+        # before its query is interrupted and TimeoutError is raised, unless
+        # the call passes its own `timeout`. None means no limit.
+        self.query_timeout = None
+
+        # Download files that Table() reads from HTTP(S) URLs to a local
+        # cache, revalidated on each use, rather than fetching them from the
+        # server every time a query over them runs. Off by default, since
+        # it writes to disk.
+        self.remote_cache = False
+
+        # Where to keep downloads. None uses the DUCKBOAT_CACHE_DIR
+        # environment variable, or ~/.cache/duckboat.
+        self.remote_cache_dir = None
+
+        # Upper bound, in bytes, on the size of the download cache.
+        self.remote_cache_size = 2**33
+
+        # Convert pandas DataFrames given to Table() or do() to Arrow once,
+        # instead of DuckDB converting them each time a query over them
+        # runs. The copy costs memory, roughly the size of the frame.
+        self.pandas_to_arrow = True
+
+
+options = _Options()
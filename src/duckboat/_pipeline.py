@@ -0,0 +1,99 @@
+"""
+do() chains built once and run many times with different parameters.
+
+    p = uck.pipeline(df, 'where x > $lo', 'select count(*)', int)
+    p(lo=3)
+    p(lo=5)
+
+The chain's SQL steps are composed into a single query, with each step
+nested as a CTE named `_`, like `options.defer_binding` does. A call binds
+the `$name` parameters it is given, so running the pipeline doesn't repeat
+the Python work of building the chain, values are never spliced into SQL
+text, and the SQL is the same on every run. DuckDB still parses and plans
+the query on each call: a prepared statement would skip that, but it can't
+read the Python tables the query names. The rest of the chain, from the
+first step that isn't SQL (like `int` or 'arrow'), is applied to the result,
+which it reads only as far as it needs: `int` runs the query with a LIMIT.
+"""
+from pathlib import Path
+
+import duckdb
+
+from .mixin_do import (
+    _KEYWORDS, _PREV, _Template, _deferred, _do, _do_one, _read_file, _to_context,
+)
+
+
+class Pipeline:
+    __slots__ = ('sql', 'tables', 'steps', 'params', 'values')
+
+    def __init__(self, A, *xs):
+        from .table import Table
+
+        ctx = _do_one({}, A) if isinstance(A, _Template) else _to_context(A)
+        for i, x in enumerate(xs):
+            if isinstance(x, dict):
+                ctx = _do_one(ctx, x)
+            elif _is_sql(x):
+                ctx = {_PREV: _deferred(ctx, _read_file(x).strip())}
+            else:
+                break
+        else:
+            i = len(xs)
+
+        tbl = ctx.get(_PREV)
+        if not isinstance(tbl, Table):
+            raise ValueError('pipeline: no table to run the chain on')
+        if tbl._plan is None:
+            tbl = _deferred({_PREV: tbl}, 'select *')
+
+        self.sql = tbl._plan.sql
+        self.tables = tbl._plan.tables
+        self.steps = xs[i:]
+        # Values from t-strings are bound already; the rest are the caller's.
+        self.values = tbl._plan.params
+        statement = duckdb.extract_statements(self.sql)[-1]
+        self.params = frozenset(statement.named_parameters) - self.values.keys()
+        if 'timeout' in self.params:
+            raise ValueError(
+                'pipeline: $timeout is taken by the timeout= argument; '
+                'rename the parameter'
+            )
+
+    def __call__(self, timeout=None, **params):
+        """
+        Run the chain with its `$name` parameters bound to `params`.
+        """
+        from .table import Table
+        from .mixin_table import _limit
+
+        if params.keys() != self.params:
+            missing = ', '.join(sorted(self.params - params.keys()))
+            extra = ', '.join(sorted(params.keys() - self.params))
+            raise TypeError(
+                'Pipeline parameters: '
+                + (f'missing {missing}' if missing else f'unexpected {extra}')
+            )
+
+        with _limit(timeout):
+            tbl = Table._from_sql(self.sql, self.tables, {**self.values, **params})
+            return _do(tbl, *self.steps)
+
+    def __repr__(self):
+        return f'Pipeline({self.sql!r})'
+
+
+def _is_sql(x):
+    if not isinstance(x, (str, Path)):
+        return False
+    s = _read_file(x).strip()
+    return s.partition(':')[0] not in _KEYWORDS
+
+
+def pipeline(A, *xs):
+    """
+    Build the do() chain `do(A, *xs)` to run repeatedly: calling the
+    result with keyword arguments binds them to the `$name` parameters of
+    its SQL, e.g., `pipeline(t, 'where x > $lo', int)(lo=3)`.
+    """
+    return Pipeline(A, *xs)
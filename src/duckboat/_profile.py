@@ -0,0 +1,113 @@
+"""
+Opt-in profiling of the queries that do() chains run.
+
+    with uck.profile() as p:
+        t.do('where x > 0', 'select sum(x)', int)
+
+    p.steps    # one Step per query bound inside the block
+    p.table()  # the same, as a Table
+
+Each query is run an extra time, under EXPLAIN ANALYZE, to measure it,
+so profile only while investigating.
+"""
+from contextvars import ContextVar
+import json
+import time
+
+from .ddb import explain_query, query
+
+_current = ContextVar('duckboat_profile', default=None)
+
+
+class Step:
+    """
+    A query bound during profiling: its SQL, the seconds spent binding
+    (parsing and planning) it and running it, the rows it produced, and
+    DuckDB's EXPLAIN ANALYZE profile as parsed JSON.
+
+    The run time of a step includes the steps before it in the chain,
+    since computing it means computing them.
+    """
+    __slots__ = ('sql', 'bind_time', 'exec_time', 'rows', 'plan')
+
+    def __init__(self, sql, bind_time, exec_time, rows, plan):
+        self.sql = sql
+        self.bind_time = bind_time
+        self.exec_time = exec_time
+        self.rows = rows
+        self.plan = plan
+
+    def asdict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    def __repr__(self):
+        return (
+            f'Step(rows={self.rows}, bind_time={self.bind_time:.6f}, '
+            f'exec_time={self.exec_time:.6f}, sql={self.sql!r})'
+        )
+
+
+class Profile:
+    __slots__ = ('steps', '_token')
+
+    def __init__(self):
+        self.steps = []
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, *exc):
+        _current.reset(self._token)
+
+    def bind(self, sql, tables, params=None):
+        start = time.perf_counter()
+        rel = query(sql, _params=params, **tables)
+        bind_time = time.perf_counter() - start
+
+        plan = explain_query(sql, tables, params, analyze=True, format='json')
+        # The root operator is EXPLAIN ANALYZE; below it is the query's own.
+        rows = plan['children'][0]['children'][0]['operator_cardinality']
+        self.steps.append(Step(sql, bind_time, plan['latency'], rows, plan))
+        return rel
+
+    def table(self):
+        """
+        The steps as a Table, with the profiles as JSON strings, e.g.,
+        for logging to a metrics system.
+        """
+        import pyarrow as pa
+        from .table import Table
+
+        rows = [
+            {'step': i, **s.asdict(), 'plan': json.dumps(s.plan)}
+            for i, s in enumerate(self.steps)
+        ]
+        data = pa.Table.from_pylist(
+            rows,
+            schema=pa.schema([
+                ('step', pa.int64()),
+                ('sql', pa.string()),
+                ('bind_time', pa.float64()),
+                ('exec_time', pa.float64()),
+                ('rows', pa.int64()),
+                ('plan', pa.string()),
+            ]),
+        )
+        return Table(data)
+
+    def __repr__(self):
+        return f'Profile({len(self.steps)} steps)'
+
+
+def profile():
+    """
+    A context manager that records every query bound by do() chains
+    (and other Table operations) inside its block. See `Profile.steps`.
+    """
+    return Profile()
+
+
+def current():
+    return _current.get()
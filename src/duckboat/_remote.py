@@ -0,0 +1,222 @@
+"""
+A local disk cache of files read from HTTP(S) URLs.
+
+DuckDB fetches a URL every time a query over it runs, and a lazy Table's
+query runs again for each repr() or conversion. With `options.remote_cache`
+turned on, a URL given to Table() is downloaded once and read from disk
+after that.
+Each later use revalidates the copy with the ETag or Last-Modified the server
+sent, so a changed file is downloaded again, while an unchanged one costs a
+conditional request answered with 304 Not Modified.
+
+Files are stored by the SHA-256 of their contents, under `blobs/`, and each
+URL's entry under `refs/` names its blob and validators, so identical files
+at different URLs are stored once. Files are written under a temporary name
+and renamed into place, so a reader never sees a partial download. Past
+`options.remote_cache_size` bytes, the least recently used files are deleted,
+except those that relations in this process still read (see `pin()`).
+"""
+from collections import Counter
+import hashlib
+import json
+import os
+from pathlib import Path, PurePosixPath
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from urllib.parse import urlsplit
+import weakref
+
+from ._options import options
+
+_CHUNK = 1 << 20
+
+# Blobs that live relations read, by name, with how many read each.
+_pinned = Counter()
+_lock = threading.Lock()
+
+
+def is_url(x):
+    return isinstance(x, str) and x.startswith(('http://', 'https://'))
+
+
+def cache_dir():
+    """
+    `options.remote_cache_dir`, the `DUCKBOAT_CACHE_DIR` environment variable,
+    or `~/.cache/duckboat`, in that order.
+    """
+    d = options.remote_cache_dir or os.environ.get('DUCKBOAT_CACHE_DIR')
+    return Path(d) if d else Path.home() / '.cache' / 'duckboat'
+
+
+def localize(x):
+    """
+    `x`, with the URLs it names replaced by the paths of their cached copies.
+    """
+    if not options.remote_cache:
+        return x
+    if is_url(x):
+        return str(fetch(x))
+    if isinstance(x, (list, tuple)) and any(map(is_url, x)):
+        out = []
+        for p in x:
+            out.append(str(fetch(p, keep=out)) if is_url(p) else p)
+        return out
+    return x
+
+
+def pin(rel, x):
+    """
+    Spare the cached files among the paths `x` from eviction while `rel`,
+    which reads them, is alive.
+    """
+    blobs = cache_dir() / 'blobs'
+    names = [Path(p).name for p in _as_list(x) if Path(p).parent == blobs]
+    with _lock:
+        _pinned.update(names)
+    weakref.finalize(rel, _unpin, names)
+
+
+def _unpin(names):
+    with _lock:
+        _pinned.subtract(names)
+        for name in names:
+            if _pinned[name] <= 0:
+                del _pinned[name]
+
+
+def _as_list(x):
+    return list(x) if isinstance(x, (list, tuple)) else [x]
+
+
+def fetch(url, keep=()):
+    """
+    The path of an up-to-date local copy of `url`, downloading it if the
+    cached copy is missing or stale. If the server can't be reached, a
+    cached copy is used as is. Eviction spares the paths in `keep`.
+    """
+    root = cache_dir()
+    ref_path = root / 'refs' / (_sha256(url.encode()) + '.json')
+    ref = _read_json(ref_path)
+    blob = root / 'blobs' / ref['blob'] if ref else None
+    if blob is not None and not blob.exists():
+        ref = blob = None
+
+    request = urllib.request.Request(url)
+    if ref is not None:
+        if ref['etag']:
+            request.add_header('If-None-Match', ref['etag'])
+        if ref['last_modified']:
+            request.add_header('If-Modified-Since', ref['last_modified'])
+
+    try:
+        response = urllib.request.urlopen(request)
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and blob is not None:
+            os.utime(blob)  # recently used
+            return blob
+        raise
+    except urllib.error.URLError:
+        if blob is not None:
+            return blob
+        raise
+
+    with response:
+        tmp, digest = _download(response, root / 'blobs')
+        blob = root / 'blobs' / (digest + _suffix(url))
+        os.replace(tmp, blob)
+        _write_json(ref_path, {
+            'url': url,
+            'blob': blob.name,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        })
+
+    _evict(root / 'blobs', keep={blob.name, *(Path(p).name for p in keep)})
+    return blob
+
+
+def mirror(path, url):
+    """
+    Download `url` to `path`, unless the file is already there.
+    """
+    path = Path(path)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with urllib.request.urlopen(url) as response:
+            tmp, _ = _download(response, path.parent)
+        os.replace(tmp, path)
+    return path
+
+
+def _download(response, directory):
+    """
+    Write the body of `response` to a temporary file in `directory`,
+    returning its path and the SHA-256 of its contents.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.download-')
+    h = hashlib.sha256()
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            while chunk := response.read(_CHUNK):
+                h.update(chunk)
+                f.write(chunk)
+        # Reading in chunks doesn't notice a connection closed early.
+        if response.length:
+            raise ConnectionError(
+                f'Download of {response.url} ended {response.length} bytes early'
+            )
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return tmp, h.hexdigest()
+
+
+def _evict(blobs, keep):
+    """
+    Delete the least recently used files in `blobs` until they fit in
+    `options.remote_cache_size` bytes, sparing those named in `keep` and
+    those pinned, which are in use.
+    """
+    entries = []
+    for p in blobs.iterdir():
+        if not p.name.startswith('.'):
+            st = p.stat()
+            entries.append((st.st_mtime, st.st_size, p))
+
+    with _lock:
+        keep = keep | _pinned.keys()
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, p in sorted(entries):
+        if total <= options.remote_cache_size:
+            break
+        if p.name not in keep:
+            p.unlink(missing_ok=True)
+            total -= size
+
+
+def _suffix(url):
+    # Keep the extension, which tells DuckDB how to read the file.
+    return ''.join(PurePosixPath(urlsplit(url).path).suffixes)
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _read_json(path):
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+
+
+def _write_json(path, obj):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.write-')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(obj, f)
+    os.replace(tmp, path)
@@ -1,36 +1,69 @@
-import random
-from string import ascii_lowercase
+from datetime import date, time, timedelta
+from decimal import Decimal
+from itertools import count
+from uuid import UUID
 
 
-def _random_name():
-    return '_t_' + ''.join(random.choices(ascii_lowercase, k=8))
+def _process_template(template, start=0, taken=()):
+    """
+    The SQL of a t-string, the tables it interpolates, by name, and the
+    values of its parameters.
 
+    A table interpolated as a variable, like `{orders}`, is named after it.
+    Other tables, like `{data['orders']}`, are named `_t0`, `_t1`, ... in
+    order, skipping names in `taken` or used by variables, so the same
+    template always gives the same SQL. An object interpolated more than
+    once that way gets one name.
 
-def _process_template(template):
+    Values other than tables, like `{n}` or `{ids}` (a list), are bound as
+    parameters named `_p{start}`, `_p{start + 1}`, ... rather than written
+    into the SQL, so they need no quoting, a template gives the same SQL
+    whatever its values, and long lists don't make long SQL. Scalars are
+    parenthesized, so they also fit where SQL takes a literal but not a
+    parameter, like `interval {n} day` or `date {d}`.
+    """
     parts = []
     tables = {}
+    params = {}
+
+    exprs = {x.expression for x in template if not isinstance(x, str)}
+    names = (
+        name for name in (f'_t{i}' for i in count())
+        if name not in exprs and name not in taken
+    )
+    anonymous = {}  # id of object -> name
 
     for item in template:
         if isinstance(item, str):
             parts.append(item)
         else:
             value = item.value
-            if isinstance(value, bool):
-                parts.append(str(value).upper())
-            elif isinstance(value, (int, float)):
-                parts.append(str(value))
-            elif isinstance(value, str):
-                escaped = value.replace("'", "''")
-                parts.append(f"'{escaped}'")
-            elif hasattr(value, '__arrow_c_stream__'):
-                expr = item.expression
-                name = expr if expr.isidentifier() else _random_name()
+            if hasattr(value, '__arrow_c_stream__'):
+                name = item.expression
+                if not name.isidentifier():
+                    if id(value) not in anonymous:
+                        anonymous[id(value)] = next(names)
+                    name = anonymous[id(value)]
                 tables[name] = value
                 parts.append(name)
+            elif isinstance(value, _PARAMS):
+                name = f'_p{start + len(params)}'
+                if isinstance(value, (list, tuple)):
+                    params[name] = list(value)
+                    parts.append('$' + name)
+                else:
+                    params[name] = value
+                    parts.append(f'(${name})')
             else:
                 raise TypeError(
-                    f'Expected a scalar or tabular object in t-string, '
+                    f'Expected a scalar, list, or tabular object in t-string, '
                     f'got {type(value).__name__}'
                 )
 
-    return ''.join(parts), tables
+    return ''.join(parts), tables, params
+
+
+_PARAMS = (
+    bool, int, float, str, bytes, Decimal, date, time, timedelta, UUID,
+    list, tuple, type(None),
+)
@@ -1,3 +1,18 @@
-from ._query import __duckboat_query__ as query
-from ._relation import form_relation
-from ._con import __duckboat_con__ as con
+from ._query import __duckboat_query__ as query, rebind, stream
+from ._relation import (
+    form_relation, parquet_files, parquet_num_rows, parquet_nbytes,
+)
+from ._con import get_con, set_pool_size, connect, configure, owner, use_con
+from ._extensions import load_extension, register_extension
+from ._persist import persist
+from ._sql import ident, literal, option_items, rename_params
+from ._timeout import CancelScope, cancel_scope, check_cancelled, time_limit
+from ._explain import explain, explain_query
+from . import _con
+
+
+def __getattr__(name):
+    # `con` is looked up on each access because `connect()` can replace it.
+    if name == 'con':
+        return _con.__duckboat_con__
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,10 +1,195 @@
+import contextlib
+import os
+import threading
+import weakref
+
 import duckdb
 
-# Create a DuckDB database connection specifically for use with Duckboat
-__duckboat_con__ = duckdb.connect(database=':memory:')
+# DuckDB settings that can be given as DUCKBOAT_<NAME> environment variables.
+_ENV_SETTINGS = (
+    'memory_limit',
+    'threads',
+    'temp_directory',
+    'max_temp_directory_size',
+    'extension_directory',
+)
+
+
+def _config():
+    config = {}
+    for name in _ENV_SETTINGS:
+        value = os.environ.get('DUCKBOAT_' + name.upper())
+        if value:
+            config[name] = value
+    return config
+
+
+def _env_database():
+    return os.environ.get('DUCKBOAT_DATABASE') or ':memory:'
+
+
+def _env_pool_size():
+    size = os.environ.get('DUCKBOAT_POOL_SIZE')
+    return int(size) if size else None
+
+
+def _track_progress(con):
+    """
+    Have DuckDB track the progress of queries on `con`, for
+    `con.query_progress()`, without printing a progress bar.
+    """
+    con.execute('set enable_progress_bar = true')
+    con.execute('set enable_progress_bar_print = false')
+    return con
+
+
+class _Pool:
+    """
+    Hands each thread a connection to the shared database, so that
+    queries from different threads run in parallel instead of queueing
+    on a single connection.
+
+    The main thread uses the root connection. Other threads get a cursor:
+    with `size=None`, every thread gets its own; otherwise at most `size`
+    cursors are created and handed out round-robin.
+    """
+    def __init__(self, con, size=None):
+        self.con = con
+        self.size = size
+        self.cursors = []
+        self.next = 0
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def get(self):
+        con = getattr(self.local, 'con', None)
+        if con is None:
+            con = self._checkout()
+            self.local.con = con
+        return con
+
+    def _checkout(self):
+        if threading.current_thread() is threading.main_thread():
+            return self.con
+
+        with self.lock:
+            if self.size is None:
+                return _track_progress(self.con.cursor())
+            if len(self.cursors) < self.size:
+                self.cursors.append(_track_progress(self.con.cursor()))
+                return self.cursors[-1]
+            cur = self.cursors[self.next % self.size]
+            self.next += 1
+            return cur
+
+    def shared(self, con):
+        """
+        Whether `con` is one of the cursors handed to several threads.
+        """
+        return any(cur is con for cur in self.cursors)
+
+
+# Create a DuckDB database connection specifically for use with Duckboat.
+# Extensions (like H3) are loaded on demand by `_extensions`, not here,
+# so that importing duckboat is fast and doesn't need the network.
+__duckboat_con__ = _track_progress(
+    duckdb.connect(database=_env_database(), config=_config())
+)
+
+_pool = _Pool(__duckboat_con__, _env_pool_size())
+
+# Functions to call after `connect()` swaps the database,
+# for modules holding state that belongs to the old one.
+_on_connect = []
+
+
+# The connection each relation was made on, which is where its queries run,
+# and so where to interrupt them.
+_owners = weakref.WeakKeyDictionary()
+
+# How each relation was made: its database's root connection and the
+# arguments to `query`, so it can be bound again on another connection.
+_recipes = weakref.WeakKeyDictionary()
+
+
+def owner(rel):
+    """
+    The connection `rel` was made on, or None if it wasn't made by `query`.
+    """
+    return _owners.get(rel)
+
+
+def get_con():
+    """
+    The connection queries on the current thread should use.
+    """
+    return _pool.get()
+
+
+@contextlib.contextmanager
+def use_con(con):
+    """
+    Run the current thread's queries on `con` within the block. Cancel
+    scopes the block is in interrupt `con` too.
+    """
+    from ._timeout import track
+
+    local = _pool.local
+    saved = getattr(local, 'con', None), getattr(local, 'rebound', None)
+    local.con, local.rebound = con, None
+    track(con)
+    try:
+        yield con
+    finally:
+        local.con, local.rebound = saved
+
+
+def set_pool_size(size):
+    """
+    Limit the number of connections shared by non-main threads.
+    `None` gives every thread its own connection.
+    """
+    global _pool
+    _pool = _Pool(__duckboat_con__, size)
+
+
+def connect(database=':memory:', read_only=False, **config):
+    """
+    Swap the database that `query`, `Table`, and `do()` run against.
+
+    `database` is ':memory:' or the path of a database file, and `config`
+    holds DuckDB settings like `memory_limit`, `threads`, or `temp_directory`.
+    Settings from `DUCKBOAT_*` environment variables apply unless
+    overridden here.
+
+    Returns the new connection. Tables built before the swap still work,
+    but are copied through Arrow when used after it.
+    """
+    global __duckboat_con__, _pool
+
+    con = _track_progress(duckdb.connect(
+        database=database,
+        read_only=read_only,
+        config={**_config(), **config},
+    ))
+    __duckboat_con__ = con
+    _pool = _Pool(con, _pool.size)
+    for f in _on_connect:
+        f()
+    return con
+
+
+def configure(**settings):
+    """
+    Change DuckDB settings, like `memory_limit`, `threads`, or
+    `temp_directory`, on the current database without reconnecting.
+
+    A `pool_size` setting is passed to `set_pool_size()`.
+    """
+    if 'pool_size' in settings:
+        set_pool_size(settings.pop('pool_size'))
 
-# Load the H3 extension because we use it in many examples.
-__duckboat_con__.execute("""
-install h3 from community;
-load h3;
-""")
+    for name, value in settings.items():
+        if not name.isidentifier():
+            raise ValueError(f'Invalid setting name: {name!r}')
+        __duckboat_con__.execute(f'set {name} = ?', [value])
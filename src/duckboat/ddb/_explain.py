@@ -0,0 +1,32 @@
+import json
+
+from ._query import __duckboat_query__ as query
+
+
+def explain(rel, analyze=False, format='text'):
+    """
+    DuckDB's physical plan for the relation `rel`, as text, or with
+    `format='json'`, as parsed JSON.
+
+    With `analyze=True`, the query is run and the plan is annotated with
+    the time spent and rows produced by each operator.
+    """
+    return explain_query('select * from rel', {'rel': rel}, None, analyze, format)
+
+
+def explain_query(sql, tables, params=None, analyze=False, format='text'):
+    """
+    Like `explain()`, for the query `sql` over the named `tables`, with its
+    `$name` parameters bound to `params`. A relation made from a query with
+    parameters has already run, so its own plan is only a scan of the result.
+    """
+    if format not in ('text', 'json'):
+        raise ValueError(f"Expected format 'text' or 'json', got {format!r}")
+
+    opts = ['analyze'] if analyze else []
+    if format == 'json':
+        opts.append('format json')
+    prefix = f'explain ({", ".join(opts)})' if opts else 'explain'
+
+    _, plan = query(f'{prefix} {sql}', _params=params, **tables).fetchone()
+    return json.loads(plan) if format == 'json' else plan
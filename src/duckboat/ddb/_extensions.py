@@ -0,0 +1,95 @@
+"""
+On-demand loading of DuckDB extensions.
+
+Nothing is installed or loaded when duckboat is imported. An extension
+is loaded either explicitly with `load_extension()`, or automatically the
+first time a query fails because it calls a function that a registered
+extension provides.
+
+Loading tries the local extension directory first, so an extension that
+has been installed once is never downloaded again. Point DuckDB at a
+shared cache with the `DUCKBOAT_EXTENSION_DIRECTORY` environment variable,
+or the `extension_directory` setting of `connect()`.
+"""
+import re
+import threading
+
+import duckdb
+
+from ._con import get_con, _on_connect
+
+_MISSING_FUNCTION = re.compile(r'Function with name (\w+) does not exist')
+
+_lock = threading.Lock()
+_loaded = set()
+_repositories = {}  # extension name -> repository (None for core extensions)
+_functions = {}     # function name -> extension name
+_prefixes = {}      # function name prefix -> extension name
+
+
+def register_extension(name, repository=None, functions=(), prefix=None):
+    """
+    Make an extension loadable on demand.
+
+    The extension is loaded the first time a query fails because one of
+    `functions`, or any function starting with `prefix`, does not exist.
+    """
+    _repositories[name] = repository
+    for f in functions:
+        _functions[f] = name
+    if prefix is not None:
+        _prefixes[prefix] = name
+
+
+def load_extension(name, repository=None):
+    """
+    Load an extension now, installing it only if it isn't already
+    in the local extension directory.
+    """
+    if repository is None:
+        repository = _repositories.get(name)
+
+    with _lock:
+        if name in _loaded:
+            return
+        con = get_con()
+        try:
+            con.load_extension(name)
+        except duckdb.IOException:
+            con.install_extension(name, repository=repository)
+            con.load_extension(name)
+        _loaded.add(name)
+
+
+def _extension_for(func):
+    if func in _functions:
+        return _functions[func]
+    for prefix, name in _prefixes.items():
+        if func.startswith(prefix):
+            return name
+    return None
+
+
+def _autoload(e):
+    """
+    Load the extension providing the missing function named in error `e`.
+
+    Returns True if an extension was loaded and the query is worth retrying.
+    """
+    m = _MISSING_FUNCTION.search(str(e))
+    if m is None:
+        return False
+
+    name = _extension_for(m.group(1))
+    if name is None or name in _loaded:
+        return False
+
+    load_extension(name)
+    return True
+
+
+# Extensions are loaded per database.
+_on_connect.append(_loaded.clear)
+
+# We use H3 in many examples.
+register_extension('h3', repository='community', prefix='h3_')
@@ -0,0 +1,70 @@
+"""
+Materializing relations into tables inside the engine.
+
+Each persisted relation gets its own table, which is dropped once the
+relation returned by `persist()` is garbage collected. Relations built
+on top of it keep it alive.
+"""
+import contextlib
+import itertools
+import tempfile
+import threading
+import weakref
+
+import duckdb
+
+from ._con import get_con, _on_connect
+from ._query import __duckboat_query__ as query
+
+_DISK = '__duckboat_disk__'
+
+_names = itertools.count()
+_lock = threading.Lock()
+_disk = None  # scratch directory holding the attached database file
+
+
+def _attach_disk(con):
+    global _disk
+
+    with _lock:
+        if _disk is None:
+            _disk = tempfile.TemporaryDirectory(prefix='duckboat_')
+            con.execute(f"attach '{_disk.name}/scratch.db' as {_DISK}")
+
+
+def _detach_disk():
+    global _disk
+    _disk = None
+
+
+def _drop(con, name):
+    with contextlib.suppress(duckdb.Error):
+        con.execute(f'drop table if exists {name}')
+
+
+def persist(rel, disk=False):
+    """
+    Compute `rel` into a new table and return a relation reading from it.
+
+    By default, the table is a temporary table on the current connection,
+    held in memory (spilling to DuckDB's temp directory if needed).
+    With `disk=True`, it is written to a scratch database file instead,
+    visible to all connections.
+    """
+    con = get_con()
+    name = f'__duckboat_persist_{next(_names)}'
+
+    if disk:
+        _attach_disk(con)
+        name = f'{_DISK}.{name}'
+        query(f'create table {name} as select * from rel', rel=rel)
+    else:
+        query(f'create temp table {name} as select * from rel', rel=rel)
+
+    out = query(f'select * from {name}')
+    weakref.finalize(out, _drop, con, name)
+    return out
+
+
+# The scratch database is attached to the current database only.
+_on_connect.append(_detach_disk)
@@ -1,25 +1,150 @@
-import inspect as __inspect__
-from ._con import __duckboat_con__
+import weakref
 
+import duckdb
+from duckdb import CatalogException, InvalidInputException
 
-def __duckboat_query__(__s__, **kwargs):
+from . import _con
+from ._con import get_con, _owners, _recipes
+from ._extensions import _autoload
+from ._timeout import check_cancelled
+
+# DuckDB finds Python tables with "replacement scans", which look up unknown
+# table names among the variables of the innermost Python frame. We evaluate
+# each query in a frame of its own whose variables are exactly the tables
+# we were given, so nothing else can leak in and no frame is mutated.
+_QUERY = compile(
+    '__con__.query(__sql__, params=__params__)', '<duckboat>', 'eval',
+)
+_EXECUTE = compile('__con__.execute(__sql__, __params__)', '<duckboat>', 'eval')
+
+
+def __duckboat_query__(sql, /, _params=None, **kwargs):
     """
     Runs a query on our DuckDB database and returns the DuckDB Relation.
 
-    We mangle the names in this file because `__duckboat_con__.query()` will,
-    by default, look for any names in the Python namespace.
-    We want to isolate it from finding any symbols unexpectedly, so
-    we're forced to hide this query away in its own file.
+    The only Python symbols visible to the query are those given in
+    `kwargs`; they are bound in a fresh namespace for each call, which
+    keeps concurrent queries from seeing each other's tables.
+
+    `sql` is positional-only, so a table can be named `sql`. `_params`
+    binds the query's `$name` parameters, given as a dict.
 
-    The intention is that the only Python symbols that are visible
-    to the DuckDB query should be those given in `kwargs`.
+    The query runs on the current thread's connection. If it calls a
+    function from a registered extension that isn't loaded yet, or uses
+    a relation created on another thread, we fix that up and try again.
 
     Ideally, DuckDB would provide a way to pass named tables
-    directly to a query (e.g., con.query(sql, tables={'a': rel}))
-    instead of relying on replacement scans that inspect the
-    caller's frame. The f_locals.update() hack is CPython-specific
-    and fragile under PEP 667 (Python 3.13+).
+    directly to a query (e.g., con.query(sql, tables={'a': rel})).
+    Registering views instead costs a catalog transaction per table,
+    and since relations are re-bound when executed, the views would have
+    to outlive every relation built on them.
     See: https://github.com/duckdb/duckdb/discussions/14041
     """
-    __inspect__.currentframe().f_locals.update(kwargs)
-    return __duckboat_con__.query(__s__)
+    con = get_con()
+    rel = _eval(_QUERY, con, sql, _params, kwargs)
+    if rel is not None:  # statements like COPY return nothing
+        _owners[rel] = con
+        _recipes[rel] = (_con.__duckboat_con__, sql, _params, kwargs)
+    return rel
+
+
+def stream(sql, /, batch_size, _params=None, **kwargs):
+    """
+    Run a query like `query()` does, and return a pyarrow RecordBatchReader
+    of its result in batches of at most `batch_size` rows, computed as
+    they're read.
+
+    Binding a query with parameters runs it in full, while executing it
+    returns a streaming result, so this reads a large result with
+    parameters without holding it in memory. A connection streams one
+    result at a time: run other queries on another.
+    """
+    con = get_con()
+    return _eval(_EXECUTE, con, sql, _params, kwargs).to_arrow_reader(batch_size)
+
+
+def _eval(code, con, sql, params, kwargs):
+    check_cancelled()
+    while True:
+        scope = {**kwargs, '__con__': con, '__sql__': sql, '__params__': params}
+        try:
+            return eval(code, scope)
+        except CatalogException as e:
+            if not _autoload(e):
+                raise
+        except InvalidInputException as e:
+            if not _localize(e, kwargs):
+                raise
+
+
+def _localize(e, tables):
+    """
+    Relations are tied to the connection that created them. If a query
+    failed because it used a relation from another thread's connection,
+    swap each such relation in `tables` for one on this connection.
+
+    Returns True if anything was swapped and the query is worth retrying.
+    """
+    if 'another Connection' not in str(e):
+        return False
+
+    con = get_con()
+    swapped = False
+    for k, v in tables.items():
+        if isinstance(v, duckdb.DuckDBPyRelation) and _owners.get(v) is not con:
+            tables[k] = _rebind(v, con)
+            swapped = True
+    return swapped
+
+
+def rebind(rel):
+    """
+    `rel`, or if it was made on another thread's connection, the same
+    query bound on this thread's, so that it runs here. Its queries can
+    then run in parallel with that thread's, and are interrupted with
+    this thread's.
+    """
+    con = get_con()
+    if _owners.get(rel, con) is con:
+        return rel
+    out = _rebind(rel, con)
+    if not isinstance(out, duckdb.DuckDBPyRelation):
+        out = __duckboat_query__('select * from data', data=out)
+    return out
+
+
+def _rebind(rel, con):
+    """
+    `rel` on `con`: bound again from the query that made it, which reads
+    its sources afresh rather than copying its result, and is kept for
+    next time. Relations we can't rebuild there, like those of a database
+    since replaced or over another connection's temporary tables, are
+    copied through Arrow.
+    """
+    rebound = _rebound()
+    if rel in rebound:
+        return rebound[rel]
+
+    out = None
+    recipe = _recipes.get(rel)
+    if recipe is not None and recipe[0] is _con.__duckboat_con__:
+        _, sql, params, kwargs = recipe
+        try:
+            out = __duckboat_query__(sql, params, **kwargs)
+        except duckdb.Error:
+            pass
+    if out is None:
+        out = rel.to_arrow_table()
+
+    rebound[rel] = out
+    return out
+
+
+def _rebound():
+    """
+    The relations rebound on this thread's connection, by original.
+    """
+    local = _con._pool.local
+    if getattr(local, 'rebound', None) is None:
+        local.rebound = weakref.WeakKeyDictionary()
+    return local.rebound
@@ -1,18 +1,182 @@
 from pathlib import Path
 
 from ._query import __duckboat_query__ as query
+from ._sql import ident, literal, option_items
 from duckdb import DuckDBPyRelation
 
+# DuckDB's multi-file readers, by file format, with the options that format
+# implies. Each reads a list of files or a glob in parallel, and discovers
+# hive partitions (`year=2024/...`) from their paths, so filters on those
+# columns skip whole files.
+_READERS = {
+    'parquet': ('read_parquet', {}),
+    'csv': ('read_csv', {}),
+    'tsv': ('read_csv', {'delim': '\t'}),
+    'json': ('read_json', {}),
+    'jsonl': ('read_json', {'format': 'newline_delimited'}),
+    'ndjson': ('read_json', {'format': 'newline_delimited'}),
+}
+_COMPRESSION = {'gz', 'zst'}
+
+# With the column types declared, a CSV file needn't be sniffed, as long as
+# its dialect is the one we write (see `save_csv()`).
+_DECLARED_CSV = {'auto_detect': False, 'header': True}
+
+
+def form_relation(x, format=None, columns=None, **options) -> DuckDBPyRelation:
+    """
+    A relation reading `x`: an object implementing `__arrow_c_stream__`,
+    or files given as a path, a glob, a list of paths, or a directory.
+
+    `format` is one of 'parquet', 'csv', 'tsv', 'json', 'jsonl', or 'ndjson',
+    and is otherwise taken from the file extension.
+
+    `columns` selects columns: a list of names, or a dict of names to
+    types. For CSV and JSON, a dict declares the schema instead of detecting
+    it, which saves sampling large files; CSV files are then read as having
+    a header and comma delimiters, unless `options` say otherwise.
+
+    `options` are passed to the file reader, e.g., `union_by_name=True`
+    to line up columns by name across files whose columns differ,
+    `filename=True` to add a column naming each row's file, or
+    `sample_size=-1` to detect CSV types from the whole file.
+    """
+    files = format is not None or columns is not None or options
 
-def form_relation(x) -> DuckDBPyRelation:
     if hasattr(x, '__arrow_c_stream__'):
+        if files:
+            raise TypeError(
+                f'Reader options only apply to files, not {type(x).__name__}'
+            )
         return query('select * from x', x=x)
-    if isinstance(x, (str, Path)):
-        try:
-            return query(f'select * from "{x}"')
-        except Exception as e:
-            raise type(e)(f'Could not read {x!r}: {e}') from e
-    raise TypeError(
-        f'Expected a tabular object implementing __arrow_c_stream__ '
-        f'or a filename string — got {type(x).__name__}'
-    )
+
+    if isinstance(x, (str, Path)) and not files and not Path(x).is_dir():
+        # A single path or glob: DuckDB picks the reader, including for
+        # remote URLs and formats its extensions add.
+        sql = f'select * from "{x}"'
+    elif isinstance(x, (str, Path, list, tuple)):
+        paths = _paths(x, format)
+        reader, implied = _reader(format or _format_of(paths))
+        options = {**implied, **options}
+        select = '*'
+
+        if isinstance(columns, dict):
+            if reader == 'read_parquet':
+                # Parquet files carry their schema, so cast to the one declared.
+                select = ', '.join(
+                    f'{ident(k)}::{v} as {ident(k)}' for k, v in columns.items()
+                )
+            else:
+                declared = _DECLARED_CSV if reader == 'read_csv' else {}
+                options = {**declared, 'columns': columns, **options}
+        elif columns is not None:
+            select = ', '.join(map(ident, columns))
+
+        sql = f'select {select} from {reader}({literal(paths)}{_args(options)})'
+    else:
+        raise TypeError(
+            f'Expected a tabular object implementing __arrow_c_stream__ '
+            f'or a filename string — got {type(x).__name__}'
+        )
+
+    try:
+        return query(sql)
+    except Exception as e:
+        raise type(e)(f'Could not read {x!r}: {e}') from e
+
+
+def _paths(x, format=None):
+    """
+    The files `x` names, as a list of paths and globs. A directory stands
+    for every data file under it, e.g., the output of a partitioned save:
+    those with the extension of the first file found in a format we read,
+    or with `format` given, of the first file found.
+    """
+    if isinstance(x, (list, tuple)):
+        if not x:
+            raise ValueError('Expected at least one file to read')
+        return [str(p) for p in x]
+
+    root = Path(x)
+    if not root.is_dir():
+        return [str(x)]
+
+    # Stop at the first match: a dataset's tree can be large, or remote.
+    for p in root.rglob('*'):
+        # Skip markers like `_SUCCESS`, hidden files like `.x.crc`, and
+        # others like `README.md`.
+        if p.name.startswith(('_', '.')):
+            continue
+        if (format is not None or _format(p) in _READERS) and p.is_file():
+            return [str(root / '**' / ('*' + _suffix(p)))]
+    raise ValueError(f'No files to read in directory {str(x)!r}')
+
+
+def _suffix(path):
+    """
+    The extension of `path`, with any compression's: `.csv.gz`, but not
+    `.2024.parquet`.
+    """
+    parts = Path(path).name.split('.')[1:]
+    n = 2 if len(parts) > 1 and parts[-1].lower() in _COMPRESSION else 1
+    return ''.join('.' + part for part in parts[-n:])
+
+
+def _format(path):
+    parts = Path(path).name.lower().split('.')[1:]
+    if parts and parts[-1] in _COMPRESSION:
+        parts.pop()
+    return parts[-1] if parts else None
+
+
+def _format_of(paths):
+    formats = {_format(p) for p in paths}
+    if len(formats) > 1:
+        raise ValueError(f'Expected files of one format, got {paths!r}')
+    fmt = formats.pop()
+    if fmt not in _READERS:
+        raise ValueError(
+            f'Unrecognized file type: {paths[0]}; pass format= to choose a reader'
+        )
+    return fmt
+
+
+def _reader(fmt):
+    if fmt not in _READERS:
+        raise ValueError(
+            f'Unrecognized format {fmt!r}; expected one of {", ".join(_READERS)}'
+        )
+    return _READERS[fmt]
+
+
+def _args(options):
+    return ''.join(f', {k} = {literal(v)}' for k, v in option_items(options))
+
+
+def parquet_files(x):
+    """
+    The files that a path, glob, list, or directory `x` names, if they're
+    all Parquet, in a form the functions below take. None otherwise.
+    """
+    try:
+        paths = _paths(x)
+    except ValueError:  # a directory of files read with `format=`
+        return None
+    if all(_format(p) == 'parquet' for p in paths):
+        return paths
+    return None
+
+
+# Parquet footers record the row count and size of each row group, so these
+# answer without scanning the data.
+
+def parquet_num_rows(paths):
+    return query(f"""
+        select sum(num_rows) from parquet_file_metadata({literal(paths)})
+    """).fetchone()[0] or 0
+
+
+def parquet_nbytes(paths):
+    return query(f"""
+        select sum(total_uncompressed_size) from parquet_metadata({literal(paths)})
+    """).fetchone()[0] or 0
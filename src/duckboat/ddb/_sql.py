@@ -0,0 +1,68 @@
+"""
+Python values written into SQL, for the options of DuckDB's file readers
+and COPY statement, which take constants rather than parameters, and
+parameters renamed in SQL, for nesting one query in another.
+"""
+from pathlib import Path
+import re
+
+import duckdb
+
+_PARAM = re.compile(r'\$([A-Za-z_]\w*)')
+
+
+def literal(v):
+    """
+    `v` as a SQL literal: a bool, number, string, or path, or a list or
+    dict of those.
+    """
+    if isinstance(v, bool):
+        return str(v).lower()
+    if isinstance(v, (int, float)):
+        return repr(v)
+    if isinstance(v, (str, Path)):
+        return "'" + str(v).replace("'", "''") + "'"
+    if isinstance(v, (list, tuple)):
+        return '[' + ', '.join(map(literal, v)) + ']'
+    if isinstance(v, dict):
+        items = (f'{literal(k)}: {literal(x)}' for k, x in v.items())
+        return '{' + ', '.join(items) + '}'
+    raise TypeError(f'Unsupported option value: {v!r}')
+
+
+def ident(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def option_items(options):
+    """
+    The items of `options`, checked to be option names with values.
+    """
+    for k, v in options.items():
+        if not k.isidentifier():
+            raise ValueError(f'Invalid option name: {k!r}')
+        if v is None:
+            raise TypeError(
+                f'Option {k}=None has no SQL value; leave it out for the default'
+            )
+        yield k, v
+
+
+def rename_params(sql, names):
+    """
+    `sql` with the `$name` parameters in the dict `names` renamed to their
+    values. Strings, comments, and quoted names are left as they are.
+    """
+    if not names:
+        return sql
+    ops = {
+        pos for pos, kind in duckdb.tokenize(sql)
+        if kind == duckdb.token_type.operator
+    }
+
+    def rename(m):
+        if m.start() not in ops or m[1] not in names:
+            return m[0]
+        return '$' + names[m[1]]
+
+    return _PARAM.sub(rename, sql)
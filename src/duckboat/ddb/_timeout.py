@@ -0,0 +1,193 @@
+"""
+Bounding and cancelling running queries.
+
+DuckDB stops the query running on a connection with `con.interrupt()`.
+When a CancelScope times out or `cancel()` is called, it interrupts its
+thread's connection once, which is where the block's queries run (tables
+made on other threads are bound again there; see `rebind()`). Queries the
+block starts after that raise right away, rather than the connection being
+interrupted again, which could stop another thread's query on it. With a
+pool of connections shared by threads (see `set_pool_size()`), the block
+runs on a cursor of its own, for the same reason. A single watchdog thread
+keeps the time for every scope.
+"""
+from contextlib import nullcontext
+from contextvars import ContextVar
+import heapq
+import itertools
+import threading
+import time
+
+import duckdb
+
+from . import _con
+from ._con import _track_progress, get_con, use_con
+
+_current = ContextVar('duckboat_cancel_scope', default=None)
+
+
+class _Watchdog:
+    """
+    A daemon thread that fires scopes when their deadlines pass.
+    """
+    def __init__(self):
+        self.heap = []  # (deadline, seq, scope)
+        self.seq = itertools.count()
+        self.cond = threading.Condition()
+        self.thread = None
+        self.prune_at = 64
+
+    def schedule(self, delay, scope):
+        with self.cond:
+            deadline = time.monotonic() + delay
+            heapq.heappush(self.heap, (deadline, next(self.seq), scope))
+            # Scopes usually exit long before their deadline, so drop them
+            # every so often rather than holding them until it passes.
+            if len(self.heap) >= self.prune_at:
+                self.heap = [x for x in self.heap if x[2]._active]
+                heapq.heapify(self.heap)
+                self.prune_at = max(64, 2 * len(self.heap))
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self._run, name='duckboat-watchdog', daemon=True,
+                )
+                self.thread.start()
+            self.cond.notify()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.heap or self.heap[0][0] > time.monotonic():
+                    wait = self.heap[0][0] - time.monotonic() if self.heap else None
+                    self.cond.wait(wait)
+                _, _, scope = heapq.heappop(self.heap)
+            scope._fire(timed_out=True)
+
+
+_watchdog = _Watchdog()
+
+
+class CancelScope:
+    """
+    A block whose queries can be cancelled from another thread, with
+    `cancel()`, or after `timeout` seconds, raising TimeoutError.
+    A cancelled query, and any the block starts after it, raises
+    `duckdb.InterruptException`.
+
+    `progress()` reports how far along the running query is.
+    """
+    __slots__ = (
+        'timeout', 'cancelled', 'timed_out',
+        '_cons', '_active', '_parent', '_lock', '_token', '_own',
+    )
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+        self.cancelled = False
+        self.timed_out = False
+        self._cons = set()
+        self._active = False
+        self._parent = None
+        self._lock = threading.Lock()
+        self._token = None
+        self._own = None
+
+    def __enter__(self):
+        self._parent = _current.get()
+        self._token = _current.set(self)
+        con = get_con()
+        if _con._pool.shared(con):
+            self._own = use_con(_track_progress(con.cursor()))
+            self._own.__enter__()  # which tracks it
+        else:
+            self.track(con)
+        self._active = True
+        if self.timeout is not None:
+            _watchdog.schedule(self.timeout, self)
+        return self
+
+    def __exit__(self, typ, e, tb):
+        with self._lock:
+            self._active = False
+        if self._own is not None:
+            self._own.__exit__(None, None, None)
+            self._own = None
+        _current.reset(self._token)
+
+        if isinstance(e, duckdb.InterruptException) and self.timed_out:
+            raise TimeoutError(f'Query timed out after {self.timeout}s') from e
+
+    def track(self, con):
+        """
+        Interrupt `con` too when the scope is cancelled.
+        """
+        scope = self
+        while scope is not None:
+            with scope._lock:
+                scope._cons.add(con)
+            scope = scope._parent
+
+    def cancel(self):
+        """
+        Interrupt the block's running query, and any it starts after.
+        """
+        self._fire(timed_out=False)
+
+    def _fire(self, timed_out):
+        with self._lock:
+            if not self._active:
+                return
+            if timed_out:
+                self.timed_out = self.timed_out or not self.cancelled
+            else:
+                self.cancelled = self.cancelled or not self.timed_out
+            for con in self._cons:
+                con.interrupt()
+
+    def progress(self):
+        """
+        DuckDB's estimate of how much of the running query is done, as a
+        percentage, or -1 if no query is running.
+        """
+        with self._lock:
+            cons = list(self._cons)
+        return max((con.query_progress() for con in cons), default=-1.0)
+
+
+def cancel_scope(timeout=None):
+    """
+    A CancelScope: queries run inside `with cancel_scope() as scope:` on
+    this thread are interrupted by `scope.cancel()` from any thread, or
+    after `timeout` seconds.
+    """
+    return CancelScope(timeout)
+
+
+def time_limit(seconds):
+    """
+    A CancelScope with a timeout of `seconds`, or no scope at all if None.
+    """
+    if seconds is None:
+        return nullcontext()
+    return CancelScope(seconds)
+
+
+def track(con):
+    """
+    Have the running cancel scopes interrupt `con` too.
+    """
+    scope = _current.get()
+    if scope is not None:
+        scope.track(con)
+
+
+def check_cancelled():
+    """
+    Raise InterruptException if a running cancel scope has fired, so the
+    block doesn't start another query.
+    """
+    scope = _current.get()
+    while scope is not None:
+        if scope.cancelled or scope.timed_out:
+            raise duckdb.InterruptException('Interrupted by a cancel scope')
+        scope = scope._parent
@@ -1,6 +1,9 @@
+from itertools import count
 from pathlib import Path
+import re
 
-from .ddb import query
+from ._options import options
+from .ddb import ident, rename_params
 
 try:
     from string.templatelib import Template as _Template
@@ -23,25 +26,145 @@ def rename(name):
     return _Rename(name)
 
 
+# Keywords in do() chains, like 'arrow' or 'persist:disk'.
+_KEYWORDS = {
+    'arrow', 'pandas', 'batches', 'hide', 'show', 'persist',
+    'explain', 'explain analyze',
+}
+
+_WHITESPACE = re.compile(r'\s')
+
+_sql_files = {}  # path -> (stat identity, contents)
+
+
 def _is_file(s):
+    """
+    Whether the string `s` names a file to read SQL from.
+
+    Keywords, and strings with whitespace (which are almost certainly SQL),
+    are ruled out without touching the filesystem, unless they end in '.sql'.
+    """
     if len(s) > 255:
         return False
+    if not s.endswith('.sql'):
+        if s.partition(':')[0] in _KEYWORDS or _WHITESPACE.search(s):
+            return False
     return Path(s).is_file()
 
 
+def _read_sql(path):
+    """
+    Read a SQL file, reusing the last read unless the file has changed.
+    """
+    st = path.stat()
+    ident = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+    hit = _sql_files.get(path)
+    if hit is not None and hit[0] == ident:
+        return hit[1]
+
+    text = path.read_text()
+    _sql_files[path] = (ident, text)
+    return text
+
+
 def _read_file(s):
     if isinstance(s, Path):
-        return s.read_text()
+        return _read_sql(s)
 
     if isinstance(s, str) and _is_file(s):
-        return Path(s).read_text()
+        return _read_sql(Path(s))
 
     return s
 
 
 def _wrap_tables(d):
+    """
+    The tables in `d` as Tables. An object under several names is wrapped
+    once, so it's read (and, for a DataFrame, converted) once.
+    """
+    from .table import Table
+
+    wrapped = {}  # id of object -> Table
+    for v in d.values():
+        if id(v) not in wrapped:
+            wrapped[id(v)] = Table(v)
+    return {k: wrapped[id(v)] for k, v in d.items()}
+
+
+def _deferred(ctx, s, params=None):
+    """
+    The result of SQL step `s`, with its `$name` parameters bound to
+    `params`, left unbound.
+
+    If the previous step is unbound too, its SQL is nested as a CTE
+    named `_`, so a run of SQL steps is bound once, as a single query,
+    when the result is first used. A cached step is read from its cache
+    instead. Other tables that are unbound queries with parameters, which
+    DuckDB would run in full when bound, are nested under their names.
+    """
     from .table import Table
-    return {k: Table(v) for k, v in d.items()}
+
+    if _PREV in ctx:
+        s = 'from _ ' + s
+    params = dict(params or {})
+    nested = {k: v for k, v in ctx.items() if _nests(k, v)}
+    tables = {k: v.rel for k, v in ctx.items() if k not in nested}
+    ctes = []
+
+    for k, v in nested.items():
+        plan = v._plan
+        # Tables named in its SQL must mean the same thing here, and not be
+        # one of the other CTEs.
+        if any(
+            tables.get(n, r) is not r or (n in nested and n != k)
+            for n, r in plan.tables.items()
+        ):
+            tables[k] = v.rel
+            continue
+
+        renamed = {}
+        for p, value in plan.params.items():
+            if p in params:
+                renamed[p] = _free_param(params, plan.params)
+                p = renamed[p]
+            params[p] = value
+        tables.update(plan.tables)
+        name = k if k == _PREV else ident(k)
+        ctes.append(f'{name} as (\n{rename_params(plan.sql, renamed)}\n)')
+
+    if ctes:
+        s = 'with ' + ', '.join(ctes) + '\n' + s
+    return Table._from_sql(s, tables, params)
+
+
+def _nests(k, v):
+    if k == _PREV:
+        return v._plan is not None and not v._cached
+    return _has_params(v)
+
+
+def _free_param(*taken):
+    """
+    The first of `_p0`, `_p1`, ... that isn't a key of any of `taken`.
+    """
+    return next(
+        name for name in (f'_p{i}' for i in count())
+        if not any(name in d for d in taken)
+    )
+
+
+def _has_params(tbl):
+    """
+    Whether `tbl` is an unbound query with parameters, which DuckDB would
+    run as soon as it's bound, so steps after it compose with it instead.
+    """
+    plan = tbl._plan if tbl is not None else None
+    return plan is not None and plan.rel is None and bool(plan.params)
+
+
+def _explain(tbl, s):
+    kind, _, fmt = s.partition(':')
+    return tbl.explain(analyze=(kind == 'explain analyze'), format=fmt or 'text')
 
 
 def _to_context(A):
@@ -73,9 +196,16 @@ def _do_one(ctx, x):
         return {**ctx, x.name: tbl}
 
     if isinstance(x, _Template):
-        sql, tables = _process_template(x)
+        # Number the template's parameters after those of the query it
+        # may be composed with, so their names don't clash.
+        prev = ctx.get(_PREV)
+        plan = prev._plan if prev is not None else None
+        start = len(plan.params) if plan is not None else 0
+        sql, tables, params = _process_template(x, start, ctx.keys())
         if tables:
             ctx = _do_one(ctx, tables)
+        if params:
+            return {_PREV: _deferred(ctx, sql, params)}
         return _do_one(ctx, sql)
 
     tbl = ctx.get(_PREV)
@@ -88,22 +218,36 @@ def _do_one(ctx, x):
             return tbl.arrow()
         if s == 'pandas':
             return tbl.df()
+        if s == 'batches':
+            return tbl.batches()
+        if s.startswith('batches:'):
+            return tbl.batches(int(s.removeprefix('batches:')))
         if s == 'hide':
             return {_PREV: tbl.hide()}
         if s == 'show':
             return {_PREV: tbl.show()}
+        if s == 'persist':
+            return {_PREV: tbl.persist()}
+        if s == 'persist:disk':
+            return {_PREV: tbl.persist(disk=True)}
+        if s.partition(':')[0] in ('explain', 'explain analyze'):
+            return _explain(tbl, s)
 
         # TODO: if DuckDB ever exposes a way to detect whether SQL already
         # has a FROM clause (e.g., parse AST), we could skip prepending
         # 'from _' when the user writes a complete query like
         # 'select * from _ as a join _ as b ...'. For now, users write
         # 'as a join _ as b ...' and we prepend 'from _' unconditionally.
+        if options.defer_binding or any(map(_has_params, ctx.values())):
+            return {_PREV: _deferred(ctx, s)}
+
         named = {k: v.rel for k, v in ctx.items()}
         if _PREV in ctx:
             sql = 'from _ ' + s
         else:
             sql = s
-        result = Table(query(sql, **named))
+        result = Table._from_sql(sql, named)
+        result._bound_rel()  # bind now, so errors point at this step
         return {_PREV: result}
 
     if tbl is not None:
@@ -123,18 +267,25 @@ def _do_one(ctx, x):
     raise ValueError(f'Unexpected argument in do() chain: {x!r}')
 
 
-def _do(A, *xs):
-    if isinstance(A, _Template):
-        ctx = _do_one({}, A)
-    else:
-        ctx = _to_context(A)
-    for x in xs:
-        ctx = _do_one(ctx, x)
+def _do(A, *xs, timeout=None):
+    from .mixin_table import _limit
+
+    with _limit(timeout):
+        if isinstance(A, _Template):
+            ctx = _do_one({}, A)
+        else:
+            ctx = _to_context(A)
+        for x in xs:
+            ctx = _do_one(ctx, x)
     if isinstance(ctx, dict) and _PREV in ctx:
         return ctx[_PREV]
     return ctx
 
 
 class DoMixin:
-    def do(self, *others):
-        return _do(self, *others)
+    def do(self, *others, timeout=None):
+        return _do(self, *others, timeout=timeout)
+
+    async def ado(self, *others, timeout=None):
+        from ._async import ado
+        return await ado(self, *others, timeout=timeout)
@@ -1,54 +1,206 @@
-from .ddb import query
+from ._options import options
+from .ddb import (
+    persist, explain, explain_query, get_con, ident, literal, option_items,
+    time_limit, use_con,
+)
+from .mixin_do import _has_params
 
 
 class TableMixin:
-    def asitem(self):
-        return self.aslist()[0]
-
-    def asdict(self):
-        df = self.df()
-        return dict(df.iloc[0])
-
-    def df(self):
-        return self.rel.df()
-
-    def arrow(self):
-        return self.rel.to_arrow_table()
-
-    def aslist(self):
-        df = self.df()
-        if len(df.columns) == 1:
-            col = df.columns[0]
-            out = list(df[col])
-        elif len(df) == 1:
-            out = list(df.loc[0])
-        else:
-            raise ValueError(
-                'DataFrame should have a single row or column, '
-                f'but has shape {df.shape}'
-            )
+    # Methods that compute the table take a `timeout` in seconds, defaulting
+    # to `options.query_timeout`, after which the query is interrupted and
+    # TimeoutError is raised.
+
+    # The as* extractors fetch only the rows they need, straight from DuckDB,
+    # rather than converting the whole result to pandas.
+
+    def asitem(self, timeout=None):
+        with _limit(timeout):
+            rel = self._over(_first_two)
+            rows = rel.fetchall()
+        if len(rel.columns) == 1:
+            return rows[0][0]
+        return _single_row(rel.columns, rows)[0]
+
+    def asdict(self, timeout=None):
+        with _limit(timeout):
+            rel = self._over(lambda t: f'from {t} limit 1')
+            rows = rel.fetchall()
+        if not rows:
+            raise IndexError('Table has no rows')
+        return dict(zip(rel.columns, rows[0]))
+
+    def df(self, timeout=None):
+        with _limit(timeout):
+            return self._output_rel().df()
+
+    def arrow(self, timeout=None):
+        with _limit(timeout):
+            return self._output_rel().to_arrow_table()
+
+    async def adf(self, timeout=None):
+        from ._async import run
+        return await run(self.df, timeout=timeout)
+
+    async def aarrow(self, timeout=None):
+        """
+        `arrow()`, awaited without blocking the event loop. The query is
+        interrupted if the awaiting task is cancelled, or after `timeout`
+        seconds, raising TimeoutError.
+        """
+        from ._async import run
+        return await run(self.arrow, timeout=timeout)
+
+    def batches(self, batch_size=1_000_000, timeout=None):
+        """
+        Stream the result as a pyarrow RecordBatchReader of batches with
+        at most `batch_size` rows, without holding the whole result in memory.
 
-        return out
+        A connection holds one streaming result at a time, ending it when
+        it runs another query. So the stream is read on a cursor of its own,
+        with the table's query bound again there, and other queries can run
+        while it's consumed. `timeout` bounds the wait for the stream to
+        start, not the time taken to read it.
+        """
+        import pyarrow as pa
+
+        with _limit(timeout):
+            cur = get_con().cursor()
+            try:
+                with use_con(cur):
+                    reader = self._over(lambda t: f'from {t}', batch_size)
+            except BaseException:
+                cur.close()
+                raise
+        return pa.RecordBatchReader.from_batches(
+            reader.schema, _stream(reader, cur, self),
+        )
+
+    def aslist(self, timeout=None):
+        with _limit(timeout):
+            if len(self.columns) == 1:
+                return self.arrow().column(0).to_pylist()
+            rel = self._over(_first_two)
+            return list(_single_row(rel.columns, rel.fetchall()))
+
+    def persist(self, disk=False, timeout=None):
+        """
+        Compute the table into a table inside DuckDB, and return a Table
+        reading from it, so that steps built on it don't recompute it.
+        With `disk=True`, the data is written to a scratch file on disk
+        rather than held in memory.
+        """
+        from .table import Table
+        with _limit(timeout):
+            return Table(persist(self.rel, disk=disk))
+
+    def explain(self, analyze=False, format='text'):
+        """
+        DuckDB's optimized physical plan for the table, as text, or with
+        `format='json'`, as parsed JSON. The plan shows which filters and
+        projections were pushed into file scans.
+
+        With `analyze=True`, the query is run, and the plan is annotated with
+        the time spent and rows produced by each operator.
+        """
+        plan = self._plan
+        if plan is not None and plan.params:
+            return explain_query(plan.sql, plan.tables, plan.params, analyze, format)
+        return explain(self.rel, analyze=analyze, format=format)
 
     @property
     def columns(self):
-        return self.rel.columns
+        return self._schema().columns
+
+    @property
+    def dtypes(self):
+        rel = self._schema()
+        return dict(zip(rel.columns, map(str, rel.dtypes)))
+
+    def _schema(self):
+        # A relation with the table's columns, found without running a
+        # query with parameters, which binding it would.
+        if _has_params(self):
+            return self._over(lambda t: f'from {t} limit 0')
+        return self.rel
 
-    def save_parquet(self, filename):
-        _save_format(self, filename, '(format parquet)')
+    def save_parquet(self, filename, timeout=None, **options):
+        with _limit(timeout):
+            _save_format(self, filename, {'format': 'parquet', **options})
 
-    def save_csv(self, filename):
-        _save_format(self, filename, "(header, delimiter ',')")
+    def save_csv(self, filename, timeout=None, **options):
+        with _limit(timeout):
+            _save_format(self, filename, {'header': True, 'delimiter': ',', **options})
 
-    def save(self, filename: str):
-        if filename.endswith('.parquet'):
-            self.save_parquet(filename)
-        elif filename.endswith('.csv'):
-            self.save_csv(filename)
+    def save(self, filename, format=None, timeout=None, **options):
+        """
+        Write the table to Parquet or CSV, by default choosing the format
+        from the extension of `filename`.
+
+        Other keyword arguments are passed to DuckDB's COPY statement, e.g.,
+        `partition_by=['year']`, `row_group_size=100_000`, `compression='zstd'`,
+        `per_thread_output=True`, or `file_size_bytes='256MB'`. Partitioned and
+        multi-file outputs write a directory of files at `filename`.
+        """
+        filename = str(filename)
+        fmt = format or _format_of(filename)
+
+        if fmt == 'parquet':
+            self.save_parquet(filename, timeout=timeout, **options)
+        elif fmt == 'csv':
+            self.save_csv(filename, timeout=timeout, **options)
+        else:
+            raise ValueError(f'Unrecognized format: {fmt}')
+
+
+def _limit(timeout):
+    return time_limit(options.query_timeout if timeout is None else timeout)
+
+
+def _first_two(t):
+    return f'from {t} limit 2'
+
+
+def _single_row(columns, rows):
+    if len(rows) != 1:
+        raise ValueError(
+            'Table should have a single row or column, but has '
+            f'{len(columns)} columns and {"2+" if rows else "no"} rows'
+        )
+    return rows[0]
+
+
+def _stream(reader, cur, tbl):
+    # The reader doesn't reference the table, which may be all that's
+    # keeping a persisted table it reads from being dropped.
+    try:
+        yield from reader
+    finally:
+        cur.close()
+
+
+def _format_of(filename):
+    if filename.endswith('.parquet'):
+        return 'parquet'
+    if filename.endswith('.csv'):
+        return 'csv'
+    raise ValueError(f'Unrecognized filetype: {filename}')
+
+
+def _copy_options(options):
+    parts = []
+    for k, v in option_items(options):
+        if k == 'partition_by' and isinstance(v, str):
+            v = [v]
+        if isinstance(v, (list, tuple)):
+            v = '(' + ', '.join(map(ident, v)) + ')'
         else:
-            raise ValueError(f'Unrecognized filetype: {filename}')
+            v = literal(v)
+        parts.append(f'{k} {v}')
+
+    return '(' + ', '.join(parts) + ')'
 
 
-def _save_format(tbl, filename, fmt):
-    s = f"copy (select * from tbl) to '{filename}' {fmt};"
-    query(s, tbl=tbl.rel)
+def _save_format(tbl, filename, options):
+    target = literal(str(filename))
+    tbl._over(lambda t: f'copy {t} to {target} {_copy_options(options)};')
@@ -1,30 +1,211 @@
-from .ddb import form_relation
-from .mixin_do import DoMixin
+from pathlib import Path
+import re
+import sys
+
+from . import _cache, _profile, _remote
+from ._options import options
+from .ddb import (
+    check_cancelled, form_relation, parquet_files, parquet_num_rows,
+    parquet_nbytes, query, rebind, stream, time_limit,
+)
+from .mixin_do import DoMixin, _has_params
 from .mixin_table import TableMixin
 
 from duckdb import DuckDBPyRelation
 
 _HIDDEN_REPR = '<Table(..., _hide=True)>'
+_ROW_COUNT = re.compile(r'\d+ rows( \(\d+ shown\))?')
+
+
+class _Plan:
+    """
+    A query over named tables that isn't bound until its relation is
+    first needed. Tables copied from one another share the plan, so it
+    is bound at most once.
+
+    `params` binds the query's `$name` parameters. DuckDB runs a query
+    with parameters in full as soon as it's bound, rather than when it's
+    read, so reading part of such a table nests its SQL in a query that
+    does (see `Table._over()`), and SQL steps after it compose with it.
+    """
+    __slots__ = ('sql', 'tables', 'params', 'rel')
+
+    def __init__(self, sql, tables, params=None):
+        self.sql = sql
+        self.tables = tables
+        self.params = params or {}
+        self.rel = None
+
+    def bind(self):
+        if self.rel is None:
+            profile = _profile.current()
+            params = self.params or None
+            if profile is None:
+                self.rel = query(self.sql, _params=params, **self.tables)
+            else:
+                self.rel = profile.bind(self.sql, self.tables, params)
+        return self.rel
 
 
 class Table(TableMixin, DoMixin):
-    rel: DuckDBPyRelation
+    _rel: DuckDBPyRelation | None
+    _plan: _Plan | None
     _hide: bool
+    _cached: bool
+    _source: object
+
+    def __init__(
+        self, other, _hide=False, format=None, columns=None, remote=None,
+        **options,
+    ):
+        """
+        A table of `other`: a Table, a DuckDB relation, an object implementing
+        `__arrow_c_stream__`, or files given as a path, a glob, a list of
+        paths, or a directory.
 
-    def __init__(self, other, _hide=False):
+        For files, `format` chooses the reader ('parquet', 'csv', 'json', ...)
+        instead of the file extension, and `columns` selects columns, or with
+        a dict of names to types, declares the schema so CSV and JSON files
+        aren't sampled to detect it. `options` go to DuckDB's reader, like
+        `union_by_name=True`, `filename=True`, or `compression='gzip'`.
+        See `ddb.form_relation()`.
+
+        With `options.remote_cache` on, files at HTTP(S) URLs are read from
+        a local cache. With `remote`, a URL, `other` is the local
+        path to download it to if the file isn't there yet.
+        """
         self._hide = _hide
+        self._plan = None
+        self._cached = False
+        self._source = None
+
+        if remote is not None:
+            other = _remote.mirror(other, remote)
+        local = _remote.localize(other)
+        fetched = local is not other
+        other = _from_pandas(local)
 
-        if isinstance(other, Table):
-            self.rel = other.rel
+        if format is not None or columns is not None or options:
+            self._rel = form_relation(other, format, columns, **options)
+            # A Parquet footer's size covers every column, not just these.
+            self._source = other if columns is None else None
+        elif isinstance(other, Table):
+            self._rel = other._rel
+            self._plan = other._plan
+            self._cached = other._cached
+            self._source = other._source
         elif isinstance(other, DuckDBPyRelation):
-            self.rel = other
+            self._rel = other
         else:
-            self.rel = form_relation(other)
+            self._rel = form_relation(other)
+            self._source = other
+
+        if fetched:
+            _remote.pin(self._rel, other)
+
+    @classmethod
+    def _from_sql(cls, sql, tables, params=None):
+        """
+        A table defined by `sql` over the named `tables`, with its `$name`
+        parameters bound to `params`, which isn't bound until its relation
+        is first needed.
+        """
+        self = cls.__new__(cls)
+        self._hide = False
+        self._cached = False
+        self._source = None
+        self._rel = None
+        self._plan = _Plan(sql, tables, params)
+        return self
+
+    @property
+    def rel(self):
+        if self._cached:
+            return self._cached_rel()
+        return self._bound_rel()
+
+    def _bound_rel(self):
+        if self._rel is None:
+            self._rel = self._plan.bind()
+        return self._rel
+
+    def _output_rel(self):
+        """
+        The relation to read when materializing this table's result, on
+        this thread's connection.
+        """
+        rel = self._cached_rel() if options.cache_results else self.rel
+        check_cancelled()
+        return rebind(rel)
+
+    def _over(self, wrap, batch_size=None):
+        """
+        The query `wrap(t)`, where `t` is a subquery reading this table's
+        result, as a relation, or with `batch_size`, streamed as a reader
+        of batches of at most that many rows.
+
+        DuckDB runs a query with parameters in full as soon as it's bound.
+        So if this table is one, not yet bound, its SQL is nested in the
+        query instead, and they're bound and run as one: a LIMIT then
+        bounds the work done, not just the rows kept.
+        """
+        if not (self._cached or options.cache_results) and _has_params(self):
+            plan = self._plan
+            sql, params, tables = wrap(f'(\n{plan.sql}\n)'), plan.params, plan.tables
+        else:
+            sql, params, tables = wrap('(from _)'), None, {'_': self._output_rel()}
+        if batch_size is None:
+            return query(sql, _params=params, **tables)
+        return stream(sql, batch_size, _params=params, **tables)
+
+    def _cache_key(self):
+        """
+        The table's SQL, parameters, and the identities of its inputs, along
+        with the inputs themselves, which the cache holds on to.
+        """
+        plan = self._plan
+        if plan is None:
+            return (None, id(self._rel)), (self._rel,)
+        names = sorted(plan.tables)
+        ids = tuple((k, id(plan.tables[k])) for k in names)
+        params = repr(sorted(plan.params.items()))
+        return (plan.sql, ids, params), tuple(plan.tables[k] for k in names)
+
+    def _cached_rel(self):
+        key, pin = self._cache_key()
+        data = _cache.get(key)
+        if data is None:
+            data = rebind(self._bound_rel()).to_arrow_table()
+            _cache.put(key, data, pin)
+        return query('select * from data', data=data)
+
+    def cache(self):
+        """
+        Compute the result now and keep it in memory, so that displaying
+        this table, converting it, or building on it doesn't recompute it.
+        Least recently used results are evicted past `options.cache_size`
+        bytes, and recomputed on next use.
+        """
+        self._cached = True
+        self._cached_rel()
+        return self
+
+    def uncache(self):
+        self._cached = False
+        _cache.discard(self._cache_key()[0])
+        return self
 
     def __repr__(self):
         if self._hide:
             return _HIDDEN_REPR
-        return repr(self.rel)
+        if options.preview_rows is None:
+            return repr(self._output_rel())
+
+        try:
+            with time_limit(options.preview_timeout):
+                return _preview(self, options.preview_rows)
+        except TimeoutError:
+            return f'<Table(..., preview timed out after {options.preview_timeout}s)>'
 
     def hide(self):
         return Table(self, _hide=True)
@@ -33,10 +214,126 @@ class Table(TableMixin, DoMixin):
         return Table(self, _hide=False)
 
     def __arrow_c_stream__(self, requested_schema=None):
-        return self.rel.__arrow_c_stream__(requested_schema)
+        return self._output_rel().__arrow_c_stream__(requested_schema)
+
+    def _known(self, cached, parquet, source):
+        """
+        A statistic of the table that's known without running it: from
+        a cached result, the footers of a Parquet file it reads, or the
+        in-memory object it reads. None otherwise.
+        """
+        if self._cached or options.cache_results:
+            data = _cache.get(self._cache_key()[0])
+            if data is not None:
+                return cached(data)
+
+        x = self._source
+        if isinstance(x, (str, Path, list, tuple)):
+            paths = parquet_files(x)
+            if paths is not None:
+                return parquet(paths)
+        elif x is not None:
+            return source(x)
+
+        return None
+
+    def nrows(self):
+        """
+        The number of rows, read from a cached result or the table's
+        source when possible, and otherwise counted.
+        """
+        n = self._known(
+            lambda data: data.num_rows,
+            parquet_num_rows,
+            lambda x: len(x) if hasattr(x, '__len__') else None,
+        )
+        if n is None:
+            n = self.do('select count(*)', int)
+        return n
+
+    def nbytes(self):
+        """
+        The approximate size of the table in memory, if it's known without
+        computing the table: from a cached result, the footers of a Parquet
+        file, or an in-memory Arrow source. Otherwise None.
+        """
+        return self._known(
+            lambda data: data.nbytes,
+            parquet_nbytes,
+            lambda x: getattr(x, 'nbytes', None),
+        )
 
     def rowcols(self):
         if self._hide:
             return _HIDDEN_REPR
-        n = self.do('select count(*)', int)
-        return f'{n} x {self.columns}'
+        return f'{self.nrows()} x {self.columns}'
+
+
+def _from_pandas(x):
+    """
+    A pandas DataFrame `x` as an Arrow table, if `options.pandas_to_arrow`.
+
+    DuckDB scans a DataFrame by converting its columns, strings especially,
+    each time a query over it runs, and a lazy table's query runs again
+    whenever it's used. Converting once here saves repeating that. Frames
+    Arrow wouldn't hold as DuckDB reads them are left as they are: those
+    with duplicate column names, which DuckDB renames (`a`, `a_1`), with
+    categoricals, which DuckDB reads as ENUMs, or with object columns of
+    anything but strings, like dicts or mixed types. So are those Arrow
+    holds in types DuckDB reads differently or not at all: half floats,
+    and pandas types like periods and intervals.
+    """
+    pd = sys.modules.get('pandas')  # if it isn't imported, x isn't a DataFrame
+    if pd is None or not isinstance(x, pd.DataFrame) or not options.pandas_to_arrow:
+        return x
+    if not x.columns.is_unique:
+        return x
+    for i, t in enumerate(x.dtypes):
+        if isinstance(t, pd.CategoricalDtype):
+            return x
+        if pd.api.types.is_object_dtype(t):
+            kind = pd.api.types.infer_dtype(x.iloc[:, i], skipna=True)
+            if kind not in ('string', 'empty'):
+                return x
+
+    import pyarrow as pa
+    try:
+        data = pa.Table.from_pandas(x, preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError):
+        return x
+    for t in data.schema.types:
+        if pa.types.is_float16(t) or isinstance(t, pa.ExtensionType):
+            return x
+    return data
+
+
+def _preview(tbl, n):
+    """
+    DuckDB's display of at most `n` rows of `tbl`. We fetch one row more
+    than we show, to tell whether there are others, but don't count them.
+    """
+    if options.preview_sample:
+        rel = tbl._over(lambda t: f'from {t} using sample reservoir({n + 1} rows)')
+        label = f'{n} sampled rows, more not counted'
+    else:
+        rel = tbl._over(lambda t: f'from {t} limit {n + 1}')
+        label = f'first {n} rows, more not counted'
+
+    data = rel.to_arrow_table()
+    more = data.num_rows > n
+    data = data.slice(0, n)
+    text = repr(query('select * from data', data=data))
+    if not more:
+        return text
+
+    box, end, footer = text.rpartition('┘\n')
+    m = _ROW_COUNT.search(footer)
+    if m and 'columns' in footer:
+        # Keep the column count where it is, taking room from the gap.
+        rest = footer[m.end():]
+        gap = len(rest) - len(rest.lstrip(' ')) - (len(label) - len(m.group()))
+        footer = footer[:m.start()] + label + ' ' * max(gap, 2) + rest.lstrip(' ')
+    else:
+        width = len(box.rsplit('\n', 1)[-1]) + 1
+        footer = label.center(width).rstrip() + '\n'
+    return box + end + footer
@@ -1,6 +1,27 @@
 import sys
 
+import pytest
+
 collect_ignore = []
 
 if sys.version_info < (3, 14):
     collect_ignore.append('test_tstrings.py')
+
+
+@pytest.fixture
+def bump_calls():
+    """
+    Registers a SQL function `bump(x) = x + 1` and returns the list of
+    values it has been called on, to count how often a query runs.
+    """
+    import duckboat as uck
+
+    calls = []
+
+    def bump(x):
+        calls.append(x)
+        return x + 1
+
+    uck.con.create_function('bump', bump, ['BIGINT'], 'BIGINT', side_effects=True)
+    yield calls
+    uck.con.remove_function('bump')
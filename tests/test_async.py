@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import duckboat as uck
+import pandas as pd
+import pytest
+
+from duckboat import _async
+
+_SLOW = 'select count(*) from range(10_000_000_000) as r'
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_ado():
+    df = pd.DataFrame({'x': range(10)})
+    t = uck.Table(df)
+
+    assert _run(uck.ado(df, 'select sum(x)', int)) == 45
+    assert _run(t.ado('select max(x)', int)) == 9
+    assert _run(uck.ado({'a': t}, 'select count(*) from a', int)) == 10
+    assert _run(uck.ado(uck.query('select 42'), int)) == 42
+
+    out = _run(uck.ado(t, 'where x < 3'))
+    assert out.do(list) == [0, 1, 2]
+
+
+def test_materialize():
+    t = uck.Table(pd.DataFrame({'x': range(10)}))
+    assert _run(t.aarrow()).num_rows == 10
+    assert _run(t.adf())['x'].sum() == 45
+    assert _run(t.do('where x < 3').aarrow()).num_rows == 3
+
+
+def test_event_loop_not_blocked():
+    t = uck.Table(uck.query('select count(*) from range(200_000_000)'))
+
+    async def main():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        task = asyncio.create_task(tick())
+        out = await t.ado(int)
+        task.cancel()
+        return out, ticks
+
+    out, ticks = _run(main())
+    assert out == 200_000_000
+    assert ticks > 1
+
+
+def _assert_root_free():
+    start = time.perf_counter()
+    assert uck.query('select 42').fetchone() == (42,)
+    assert time.perf_counter() - start < 1
+
+
+def test_timeout():
+    t = uck.Table(uck.query(_SLOW))
+
+    with pytest.raises(TimeoutError, match='0.1s'):
+        _run(t.aarrow(timeout=0.1))
+    _assert_root_free()
+
+    with pytest.raises(TimeoutError):
+        _run(uck.ado(t, int, timeout=0.1))
+    _assert_root_free()
+
+
+def test_cancel():
+    t = uck.Table(uck.query(_SLOW))
+
+    async def main():
+        task = asyncio.create_task(t.ado(int))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.1)
+
+    _run(main())
+    _assert_root_free()
+
+
+def test_cancelled_before_start():
+    job = _async._Job(print, ('not printed',))
+    job.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        job()
@@ -1,5 +1,6 @@
 import duckboat as uck
 import pandas as pd
+import pytest
 
 
 def test_str():
@@ -83,3 +84,47 @@ def test_long_sql_string():
     long_sql = 'select ' + ', '.join(f'a as a{i}' for i in range(200))
     result = t.do(long_sql)
     assert isinstance(result, uck.Table)
+
+
+def test_relation():
+    rel = uck.query('select 1 as a')
+    assert uck.Table(rel).do('select a + 1 as a', int) == 2
+
+
+def test_sql_snippets_skip_filesystem(monkeypatch):
+    from pathlib import Path
+
+    monkeypatch.setattr(
+        Path, 'is_file', lambda self: pytest.fail(f'checked the filesystem for {self}')
+    )
+
+    t = uck.Table(pd.DataFrame({'a': [0]}))
+    assert t.do('select a + 1 as a', '\twhere a > 0', int) == 1
+    assert t.do('hide', 'show', 'persist', 'batches:10').read_all().num_rows == 1
+
+
+def test_sql_file_cached(monkeypatch, tmp_path):
+    import os
+    from pathlib import Path
+
+    reads = []
+    read_text = Path.read_text
+
+    def counting_read_text(self, *args, **kwargs):
+        reads.append(self)
+        return read_text(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, 'read_text', counting_read_text)
+
+    f = tmp_path / 'q.sql'
+    f.write_text('select a + 1 as a')
+    t = uck.Table(pd.DataFrame({'a': [0]}))
+
+    assert t.do(str(f), f, str(f), int) == 3
+    assert len(reads) == 1
+
+    f.write_text('select a + 10 as a')
+    st = f.stat()
+    os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert t.do(f, int) == 10
+    assert len(reads) == 2
@@ -0,0 +1,104 @@
+import duckboat as uck
+import pandas as pd
+import pytest
+
+from duckboat import _cache
+
+
+@pytest.fixture(autouse=True)
+def calls(bump_calls):
+    _cache.clear()
+    yield bump_calls
+    uck.options.cache_results = False
+    uck.options.defer_binding = False
+    uck.options.cache_size = 2**30
+    _cache.clear()
+
+
+def _expensive(n=3):
+    return uck.do(pd.DataFrame({'x': range(n)}), 'select bump(x) as x')
+
+
+def test_cache(calls):
+    t = _expensive().cache()
+    assert len(calls) == 3
+
+    repr(t)
+    t.df()
+    assert t.do('select sum(x)', int) == 6
+    assert t.hide().show().do(list) == [1, 2, 3]
+    assert len(calls) == 3
+
+
+def test_uncache(calls):
+    t = _expensive().cache().uncache()
+    assert _cache.nbytes() == 0
+
+    t.df()
+    assert len(calls) == 6
+
+
+def test_no_cache_recomputes(calls):
+    t = _expensive()
+    t.df()
+    t.df()
+    assert len(calls) == 6
+
+
+def test_eviction():
+    a = uck.Table(pd.DataFrame({'x': range(100)})).cache()
+    size = _cache.nbytes()
+    uck.options.cache_size = size
+
+    b = _expensive(100).cache()
+    assert _cache.nbytes() <= size
+    assert _cache.get(a._cache_key()[0]) is None
+    assert _cache.get(b._cache_key()[0]) is not None
+
+    # evicted results are recomputed when next used
+    assert a.do('select count(*)', int) == 100
+
+
+def test_too_big_to_cache():
+    uck.options.cache_size = 10
+    t = _expensive(100).cache()
+    assert _cache.nbytes() == 0
+    assert len(t.do(list)) == 100
+
+
+def test_cache_results_option(calls):
+    uck.options.cache_results = True
+    t = _expensive()
+    t.df()
+    t.arrow()
+    repr(t)
+    assert len(calls) == 3
+
+
+def test_cache_results_across_rebuilt_chains(calls):
+    """With deferred binding, rebuilding the same chain hits the cache."""
+    uck.options.cache_results = True
+    uck.options.defer_binding = True
+
+    df = pd.DataFrame({'x': range(3)})
+    t = uck.Table(df)
+    for _ in range(3):
+        assert t.do('select bump(x) as x', 'select sum(x)', int) == 6
+    assert len(calls) == 3
+
+
+def test_deferred_steps_read_the_cache(calls):
+    uck.options.defer_binding = True
+    t = uck.Table(pd.DataFrame({'x': range(5)})).do('select bump(x) as y').cache()
+    assert t.do('select count(*)', int) == 5
+    assert t.do('where y > 2', 'select sum(y)', int) == 12
+    assert len(calls) == 5
+
+
+def test_put_replaces():
+    import pyarrow as pa
+
+    _cache.put('k', pa.table({'x': [1]}))
+    _cache.put('k', pa.table({'x': [1, 2]}))
+    assert _cache.nbytes() == pa.table({'x': [1, 2]}).nbytes
+    assert _cache.get('k').num_rows == 2
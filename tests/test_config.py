@@ -0,0 +1,68 @@
+import duckboat as uck
+import pandas as pd
+import pytest
+
+from duckboat.ddb import _con
+
+
+@pytest.fixture
+def fresh_con():
+    yield
+    uck.connect()
+    uck.ddb.set_pool_size(None)
+
+
+def _setting(name):
+    return uck.query(f"select current_setting('{name}')").fetchone()[0]
+
+
+def test_configure(fresh_con):
+    uck.configure(memory_limit='1GB', threads=2, pool_size=3)
+    assert _setting('threads') == 2
+    assert _setting('memory_limit') == '953.6 MiB'
+    assert _con._pool.size == 3
+
+
+def test_configure_bad_name(fresh_con):
+    with pytest.raises(ValueError, match='Invalid setting'):
+        uck.configure(**{'threads; drop table x': 1})
+
+
+def test_connect_file(fresh_con, tmp_path):
+    db = str(tmp_path / 'test.db')
+
+    assert uck.connect(db, threads=1) is uck.con
+    assert _setting('threads') == 1
+
+    uck.con.execute('create table foo as select 42 as x')
+    uck.connect()
+    with pytest.raises(Exception):
+        uck.Table('foo')
+
+    uck.connect(db, read_only=True)
+    assert uck.Table('foo').do(int) == 42
+
+
+def test_tables_survive_connect(fresh_con):
+    t = uck.Table(pd.DataFrame({'x': [1, 2, 3]}))
+    uck.connect()
+    assert t.do('select sum(x)', int) == 6
+
+
+def test_env(monkeypatch):
+    monkeypatch.setenv('DUCKBOAT_MEMORY_LIMIT', '2GB')
+    monkeypatch.setenv('DUCKBOAT_THREADS', '4')
+    monkeypatch.setenv('DUCKBOAT_DATABASE', 'data.db')
+    monkeypatch.setenv('DUCKBOAT_POOL_SIZE', '8')
+
+    assert _con._config() == {'memory_limit': '2GB', 'threads': '4'}
+    assert _con._env_database() == 'data.db'
+    assert _con._env_pool_size() == 8
+
+
+def test_env_defaults(monkeypatch):
+    for name in ['DATABASE', 'POOL_SIZE', 'MEMORY_LIMIT', 'THREADS']:
+        monkeypatch.delenv('DUCKBOAT_' + name, raising=False)
+
+    assert _con._env_database() == ':memory:'
+    assert _con._env_pool_size() is None
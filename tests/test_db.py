@@ -27,6 +27,18 @@ def test_dict_chain():
     assert out == list(range(10))
 
 
+def test_dict_same_object():
+    from duckboat.mixin_do import _wrap_tables
+
+    a = pd.DataFrame({'x': range(10)})
+    tables = _wrap_tables({'a': a, 'b': a, 'c': a.copy()})
+    assert tables['a'] is tables['b']
+    assert tables['a'] is not tables['c']
+
+    out = uck.do({'a': a, 'b': a}, 'select count(*) from a join b using (x)', int)
+    assert out == 10
+
+
 def test_mid_chain_join():
     t1 = pd.DataFrame({'x': range(10), 'y': range(10)})
     t2 = pd.DataFrame({'x': range(5), 'z': [100, 200, 300, 400, 500]})
@@ -137,3 +149,37 @@ def test_polars_dict_value():
 def test_rename_no_table():
     with pytest.raises(ValueError, match='no implicit table'):
         uck.do({'a': pd.DataFrame({'x': [1]})}, uck.rename('b'))
+
+
+def test_query_only_sees_given_tables():
+    import duckdb
+
+    hidden = pd.DataFrame({'x': [1]})  # noqa: F841
+    with pytest.raises(duckdb.CatalogException, match='hidden'):
+        uck.query('select * from hidden')
+
+    with pytest.raises(duckdb.CatalogException, match='kwargs'):
+        uck.query('select * from kwargs', t=hidden)
+
+
+def test_table_named_sql():
+    df = pd.DataFrame({'x': [1, 2]})
+    assert uck.query('select sum(x) from sql', sql=df).fetchone() == (3,)
+
+
+def test_explain():
+    rel = uck.query('select range as x from range(10) where x > 5')
+
+    assert 'RANGE' in uck.ddb.explain(rel)
+    assert uck.ddb.explain(rel, format='json')[0]['name']
+    assert 'Query Profiling Information' in uck.ddb.explain(rel, analyze=True)
+    assert uck.ddb.explain(rel, analyze=True, format='json')['latency'] >= 0
+
+    with pytest.raises(ValueError, match="'text' or 'json'"):
+        uck.ddb.explain(rel, format='yaml')
+
+
+def test_rename_params():
+    sql = "select $a + $ab, '$a', \"$a\" -- $a\n"
+    out = uck.ddb.rename_params(sql, {'a': 'b'})
+    assert out == "select $b + $ab, '$a', \"$a\" -- $a\n"
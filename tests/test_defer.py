@@ -0,0 +1,87 @@
+import duckboat as uck
+import duckdb
+import pandas as pd
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def defer_binding():
+    uck.options.defer_binding = True
+    yield
+    uck.options.defer_binding = False
+
+
+def test_chain_is_bound_once():
+    t = uck.Table(pd.DataFrame({'x': range(10)}))
+    out = t.do('where x > 2', 'select x + 1 as x', 'select sum(x) as x')
+
+    assert out._plan.rel is None
+    assert out._plan.sql.count('with _ as') == 2
+    assert out.do(int) == 49
+    assert out._plan.rel is not None
+
+
+def test_matches_eager():
+    df = pd.DataFrame({'x': [1, 2, 3, 4, 5]})
+    steps = [
+        'where x <= 3',
+        'as a cross join _ as b select a.x + b.x as x',
+        uck.rename('t'),
+        'from t select x * 2 as x',
+        'order by x desc',
+        'limit 4',
+        list,
+    ]
+
+    deferred = uck.do(df, *steps)
+    uck.options.defer_binding = False
+    assert deferred == uck.do(df, *steps) == [12, 10, 10, 8]
+
+
+def test_dict_tables():
+    a = pd.DataFrame({'x': range(10)})
+    b = pd.DataFrame({'x': range(5), 'y': range(5)})
+
+    out = uck.do(
+        {'a': a},
+        'select * from a',
+        {'b': b},
+        'join b using (x)',
+        'select sum(y)',
+        int,
+    )
+    assert out == 10
+
+
+def test_conflicting_names():
+    """A name rebound mid-chain can't be merged into one query."""
+    a1 = pd.DataFrame({'x': [1, 2, 3], 'y': [1, 1, 1]})
+    a2 = pd.DataFrame({'x': [1, 2], 'z': [10, 10]})
+
+    out = uck.do(
+        pd.DataFrame({'x': [1, 2, 3]}),
+        {'a': a1},
+        'join a using (x)',
+        {'a': a2},
+        'join a using (x)',
+        'select sum(y + z)',
+        int,
+    )
+    assert out == 22
+
+
+def test_errors_surface_on_use():
+    t = uck.Table(pd.DataFrame({'x': [1]})).do('select nope')
+    with pytest.raises(duckdb.BinderException, match='nope'):
+        repr(t)
+
+
+def test_hide():
+    t = uck.Table(pd.DataFrame({'x': [1]})).do('select x + 1 as x', 'hide')
+    assert repr(t) == '<Table(..., _hide=True)>'
+    assert t.do('show', int) == 2
+
+
+def test_unknown_option():
+    with pytest.raises(AttributeError):
+        uck.options.not_an_option = True
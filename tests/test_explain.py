@@ -0,0 +1,48 @@
+import duckboat as uck
+import pytest
+
+
+@pytest.fixture
+def parquet_file(tmp_path):
+    path = tmp_path / 'x.parquet'
+    uck.query('select range as x, range * 2 as y from range(100)').write_parquet(
+        str(path)
+    )
+    return str(path)
+
+
+def test_pushdown(parquet_file):
+    t = uck.do(parquet_file, 'where x > 5', 'select y')
+
+    plan = t.do('explain')
+    assert 'PARQUET_SCAN' in plan
+    assert 'Filters: x>5' in plan
+
+    [scan] = t.do('explain:json')
+    assert scan['name'] == 'PARQUET_SCAN'
+    assert scan['extra_info']['Projections'] == 'y'
+    assert scan['extra_info']['Filters'] == 'x>5'
+
+    assert t.explain() == plan
+
+
+def test_explain_analyze(parquet_file):
+    t = uck.do(parquet_file, 'where x > 5', 'select y')
+
+    assert 'Query Profiling Information' in t.do('explain analyze')
+
+    plan = t.do('explain analyze:json')
+    assert plan['latency'] >= 0
+    assert plan['cumulative_rows_scanned'] > 0
+
+
+def test_explain_bad_format(parquet_file):
+    with pytest.raises(ValueError, match="'text' or 'json'"):
+        uck.do(parquet_file, 'explain:yaml')
+
+
+def test_explain_with_parameters():
+    # The plan of the query itself, not of the result DuckDB already computed.
+    t = uck.Table._from_sql('select * from range(10) where range > $lo', {}, {'lo': 5})
+    assert 'RANGE' in t.explain()
+    assert t.nrows() == 4
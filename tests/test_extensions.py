@@ -0,0 +1,83 @@
+import duckboat as uck
+import duckdb
+import pytest
+
+from duckboat.ddb import _extensions
+
+
+def _is_loaded(name):
+    return uck.con.sql(f"""
+        select loaded from duckdb_extensions()
+        where extension_name = '{name}'
+    """).fetchall() == [(True,)]
+
+
+def test_h3_not_loaded_at_import():
+    assert not _is_loaded('h3')
+    assert 'h3' not in _extensions._loaded
+
+
+def test_unknown_function():
+    with pytest.raises(duckdb.CatalogException, match='not_a_function'):
+        uck.query('select not_a_function(1)')
+
+    with pytest.raises(duckdb.CatalogException, match='not_a_table'):
+        uck.query('from not_a_table')
+
+
+def test_load_extension():
+    uck.load_extension('json')
+    uck.load_extension('json')  # second call is a no-op
+    assert 'json' in _extensions._loaded
+    assert _is_loaded('json')
+
+
+def test_autoload_on_missing_function(monkeypatch):
+    monkeypatch.setattr(_extensions, '_loaded', set())
+    monkeypatch.setattr(_extensions, '_functions', {})
+    monkeypatch.setattr(_extensions, '_prefixes', {})
+
+    uck.register_extension('json', prefix='uck_test_')
+
+    # json loads, but doesn't provide the function, so the error surfaces
+    with pytest.raises(duckdb.CatalogException, match='uck_test_fn'):
+        uck.query('select uck_test_fn(1)')
+    assert 'json' in _extensions._loaded
+
+
+def test_extension_for(monkeypatch):
+    monkeypatch.setattr(_extensions, '_functions', {})
+    monkeypatch.setattr(_extensions, '_prefixes', {})
+
+    uck.register_extension('spatial', functions=['st_point'], prefix='st_')
+    assert _extensions._extension_for('st_point') == 'spatial'
+    assert _extensions._extension_for('st_area') == 'spatial'
+    assert _extensions._extension_for('h3_latlng_to_cell') is None
+
+
+def test_install_when_not_cached(monkeypatch):
+    calls = []
+
+    class FakeCon:
+        def load_extension(self, name):
+            calls.append(('load', name))
+            if ('install', name) not in calls:
+                raise duckdb.IOException('not found')
+
+        def install_extension(self, name, repository=None):
+            calls.append(('install', name))
+
+    monkeypatch.setattr(_extensions, 'get_con', FakeCon)
+    monkeypatch.setattr(_extensions, '_loaded', set())
+
+    uck.load_extension('h3')
+    assert calls == [('load', 'h3'), ('install', 'h3'), ('load', 'h3')]
+
+
+def test_loaded_resets_on_connect():
+    uck.load_extension('json')
+    try:
+        uck.connect()
+        assert 'json' not in _extensions._loaded
+    finally:
+        uck.connect()
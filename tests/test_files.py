@@ -0,0 +1,175 @@
+import duckboat as uck
+import duckdb
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    """A hive-partitioned dataset: `g=0/`, `g=1/`, `g=2/`."""
+    df = pd.DataFrame({'a': range(90), 'g': [i % 3 for i in range(90)]})
+    out = tmp_path / 'data'
+    uck.Table(df).save(out, format='parquet', partition_by='g')
+    return out
+
+
+def test_list_of_files(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f'{i}.parquet'
+        uck.do(pd.DataFrame({'a': [i, i]}), 'select *').save(path)
+        paths.append(path)
+
+    t = uck.do(paths, 'select sum(a)', int)
+    assert t == 6
+    assert uck.Table(tuple(map(str, paths))).nrows() == 6
+
+
+def test_list_of_csv_files(tmp_path):
+    paths = []
+    for i in range(2):
+        path = str(tmp_path / f'{i}.csv')
+        uck.Table(pd.DataFrame({'a': [i]})).save(path)
+        paths.append(path)
+
+    assert uck.do(paths, 'select sum(a)', int) == 1
+    assert uck.Table(paths).nrows() == 2
+
+    t = uck.Table(paths, columns={'a': 'VARCHAR'}, header=True, sample_size=1)
+    assert t.dtypes == {'a': 'VARCHAR'}
+
+
+def test_compressed_files(tmp_path):
+    path = str(tmp_path / 'x.csv.gz')
+    uck.Table(pd.DataFrame({'a': [1, 2]})).save_csv(path, compression='gzip')
+    assert uck.do([path], 'select sum(a)', int) == 3
+
+
+def test_directory(dataset):
+    t = uck.Table(dataset)
+    assert t.nrows() == 90
+    assert t.nbytes() > 0
+    assert sorted(t.columns) == ['a', 'g']
+    assert t.do('where g = 1', 'select sum(a)', int) == sum(range(1, 90, 3))
+
+    # partition filters skip whole files
+    plan = t.do('where g = 1', 'explain')
+    assert 'Scanning Files: 1/3' in plan
+
+    (dataset / '_SUCCESS').touch()
+    (dataset / 'README.md').touch()
+    assert uck.Table(str(dataset)).nrows() == 90
+
+
+def test_directory_suffixes(tmp_path):
+    df = pd.DataFrame({'a': [1, 2]})
+    uck.Table(df).save_csv(tmp_path / 'x.2024.csv.gz', compression='gzip')
+    uck.Table(df).save_csv(tmp_path / 'y.csv.gz', compression='gzip')
+    assert uck.Table(tmp_path).nrows() == 4
+
+    # with format given, any file will do
+    (tmp_path / 'txt').mkdir()
+    (tmp_path / 'txt' / 'z.txt').write_text('a\n3\n')
+    assert uck.Table(tmp_path / 'txt', format='csv').nrows() == 1
+
+
+def test_union_by_name(tmp_path):
+    uck.Table(pd.DataFrame({'a': [1]})).save(tmp_path / 'x.parquet')
+    uck.Table(pd.DataFrame({'b': ['q'], 'a': [2]})).save(tmp_path / 'y.parquet')
+
+    t = uck.Table(f'{tmp_path}/*.parquet', union_by_name=True, filename=True)
+    out = t.do('select a, b, parse_filename(filename) as f order by a', 'arrow')
+    assert out.to_pylist() == [
+        {'a': 1, 'b': None, 'f': 'x.parquet'},
+        {'a': 2, 'b': 'q', 'f': 'y.parquet'},
+    ]
+
+
+def test_options_on_a_directory(dataset):
+    t = uck.Table(dataset, hive_partitioning=False)
+    assert t.columns == ['a']
+
+
+def test_errors(tmp_path):
+    with pytest.raises(ValueError, match='at least one file'):
+        uck.Table([])
+    with pytest.raises(ValueError, match='one format'):
+        uck.Table(['x.parquet', 'y.csv'])
+    with pytest.raises(ValueError, match='Unrecognized file type'):
+        uck.Table(['x.xlsx'])
+    with pytest.raises(ValueError, match='No files'):
+        uck.Table(tmp_path)
+    (tmp_path / 'notes.txt').touch()
+    with pytest.raises(ValueError, match='No files'):
+        uck.Table(tmp_path)
+    with pytest.raises(duckdb.IOException, match='nonexistent.parquet'):
+        uck.Table(['nonexistent.parquet'])
+
+
+def test_bad_options():
+    with pytest.raises(TypeError, match='only apply to files'):
+        uck.Table(pd.DataFrame({'a': [1]}), filename=True)
+    with pytest.raises(TypeError, match='got int'):
+        uck.Table(1, filename=True)
+    with pytest.raises(ValueError, match='Invalid option'):
+        uck.Table('x.parquet', **{'filename) --': True})
+    with pytest.raises(TypeError, match='Unsupported option value'):
+        uck.Table('x.parquet', filename=object())
+    with pytest.raises(TypeError, match='filename=None'):
+        uck.Table('x.parquet', filename=None)
+
+
+def test_format(tmp_path):
+    path = tmp_path / 'x.txt'
+    path.write_text('a|b\n1|x\n2|y\n')
+
+    with pytest.raises(ValueError, match='pass format='):
+        uck.Table([path])
+    with pytest.raises(ValueError, match="Unrecognized format 'xlsx'"):
+        uck.Table(path, format='xlsx')
+
+    t = uck.Table(path, format='csv')
+    assert t.do('select sum(a)', int) == 3
+
+    path = tmp_path / 'x.data'
+    path.write_text('a\tb\n1\tx\n')
+    assert uck.Table(path, format='tsv').asdict() == {'a': 1, 'b': 'x'}
+
+    path = tmp_path / 'x.log'
+    path.write_text('{"a": 1}\n{"a": 2}\n')
+    assert uck.Table(path, format='ndjson').aslist() == [1, 2]
+
+
+def test_declared_csv_schema(tmp_path):
+    path = tmp_path / 'x.csv'
+    uck.Table(pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']})).save(path)
+
+    t = uck.Table(path, columns={'a': 'SMALLINT', 'b': 'VARCHAR'})
+    assert t.dtypes == {'a': 'SMALLINT', 'b': 'VARCHAR'}
+    assert t.do('select sum(a)', int) == 3
+
+    # without sniffing, the header is taken from the options
+    with pytest.raises(duckdb.ConversionException):
+        uck.Table(path, columns={'a': 'INT', 'b': 'VARCHAR'}, header=False).df()
+
+
+def test_declared_json_schema(tmp_path):
+    path = tmp_path / 'x.json'
+    path.write_text('{"a": 1, "b": "x"}\n{"a": 2, "b": "y"}\n')
+
+    t = uck.Table(path, columns={'a': 'DOUBLE'})
+    assert t.dtypes == {'a': 'DOUBLE'}
+    assert t.aslist() == [1.0, 2.0]
+
+
+def test_parquet_columns(tmp_path):
+    path = tmp_path / 'x.parquet'
+    uck.Table(pd.DataFrame({'a': [1, 2], 'b': ['x', 'y'], 'c': [0, 0]})).save(path)
+
+    t = uck.Table(path, columns=['b', 'a'])
+    assert t.columns == ['b', 'a']
+    assert t.nbytes() is None
+
+    t = uck.Table(path, columns={'a': 'DOUBLE'})
+    assert t.dtypes == {'a': 'DOUBLE'}
+    assert t.nrows() == 2
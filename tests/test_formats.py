@@ -14,8 +14,39 @@ def test_dict():
     df = pd.DataFrame(d)
     t = uck.Table(df)
 
-    assert t.asdict() == d
-    assert t.do(dict) == d
+    assert t.asdict() == dict(a=1, b=2, c=3)
+    assert t.do(dict) == dict(a=1, b=2, c=3)
+
+
+def test_extract_without_pandas(monkeypatch):
+    monkeypatch.setattr(
+        duckdb.DuckDBPyRelation, 'df', lambda self: pytest.fail('went through pandas')
+    )
+
+    t = uck.Table(uck.query('select 1 as a, 2 as b'))
+    assert t.asitem() == 1
+    assert t.aslist() == [1, 2]
+    assert t.asdict() == dict(a=1, b=2)
+
+    t = uck.query('select range as x from range(5)')
+    assert uck.Table(t).aslist() == [0, 1, 2, 3, 4]
+    assert uck.do(t, 'select count(*)', int) == 5
+
+
+def test_extract_errors():
+    t = uck.Table(uck.query('select range as x, 0 as y from range(5)'))
+    with pytest.raises(ValueError, match='2 columns and 2\\+ rows'):
+        t.aslist()
+    with pytest.raises(ValueError, match='2 columns and 2\\+ rows'):
+        t.asitem()
+
+    t = t.do('where x < 0')
+    with pytest.raises(ValueError, match='2 columns and no rows'):
+        t.aslist()
+    with pytest.raises(IndexError, match='no rows'):
+        t.asdict()
+    with pytest.raises(IndexError):
+        t.do('select x', int)
 
 
 def test_bad_object():
@@ -106,3 +137,93 @@ def test_to_unknown_format():
 
     with pytest.raises(ValueError):
         t1.save('test.not_a_format')
+
+
+def test_batches():
+    import pyarrow as pa
+
+    t = uck.Table(pd.DataFrame({'a': range(10_000)}))
+
+    reader = t.batches(batch_size=1000)
+    assert isinstance(reader, pa.RecordBatchReader)
+    sizes = [len(b) for b in reader]
+    assert sum(sizes) == 10_000
+    assert max(sizes) <= 1000
+
+    reader = t.do('where a < 5000', 'batches:2048')
+    assert sum(len(b) for b in reader) == 5000
+
+    reader = t.do('batches')
+    assert reader.read_all()['a'].to_pylist() == list(range(10_000))
+
+
+def test_batches_with_other_queries():
+    t = uck.Table(uck.query('select range as a from range(100_000)'))
+
+    n = 0
+    for b in t.do('where a >= 0').batches(10_000):
+        n += len(b)
+        assert uck.query('select 1').fetchall() == [(1,)]
+    assert n == 100_000
+
+
+def test_save_partitioned(tmp_path):
+    df = pd.DataFrame({'a': range(100), 'g': [i % 3 for i in range(100)]})
+    out = tmp_path / 'out'
+
+    uck.Table(df).save(out, format='parquet', partition_by='g')
+    assert sorted(p.name for p in out.iterdir()) == ['g=0', 'g=1', 'g=2']
+
+    t = uck.Table(f'{out}/**/*.parquet')
+    assert t.do('select count(*)', int) == 100
+    assert t.do('where g = 1', 'select sum(a)', int) == sum(range(1, 100, 3))
+
+
+def test_save_parquet_options(tmp_path):
+    import pyarrow.parquet as pq
+
+    name = str(tmp_path / 'x.parquet')
+    t = uck.Table(pd.DataFrame({'a': range(10_000)}))
+    t.save(name, row_group_size=2048, compression='zstd')
+
+    meta = pq.ParquetFile(name).metadata
+    assert meta.num_rows == 10_000
+    assert meta.row_group(0).num_rows == 2048
+    assert meta.row_group(0).column(0).compression == 'ZSTD'
+
+
+def test_save_multiple_files(tmp_path):
+    t = uck.Table(pd.DataFrame({'a': range(100_000)}))
+
+    t.save(tmp_path / 'x', format='parquet', per_thread_output=True)
+    t.save(
+        tmp_path / 'y',
+        format='parquet',
+        file_size_bytes=1000,
+        row_group_size=10_000,
+    )
+    assert len(list((tmp_path / 'y').iterdir())) > 1
+
+    for d in ['x', 'y']:
+        t = uck.Table(f'{tmp_path / d}/*.parquet')
+        assert t.do('select count(*)', int) == 100_000
+
+
+def test_save_csv_options(tmp_path):
+    name = str(tmp_path / 'x.csv')
+    uck.Table(pd.DataFrame({'a': [1, 2]})).save(name, delimiter='|', header=False)
+    with open(name) as f:
+        assert f.read().split() == ['1', '2']
+
+
+def test_save_bad_options():
+    t = uck.Table(pd.DataFrame({'a': [1]}))
+
+    with pytest.raises(ValueError, match='Unrecognized format'):
+        t.save('x', format='xlsx')
+    with pytest.raises(ValueError, match='Invalid option'):
+        t.save('x.parquet', **{'compression zstd)': 1})
+    with pytest.raises(TypeError, match='compression=None'):
+        t.save('x.parquet', compression=None)
+    with pytest.raises(TypeError, match='Unsupported option value'):
+        t.save('x.parquet', compression=object())
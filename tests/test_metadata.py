@@ -0,0 +1,90 @@
+import duckboat as uck
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from duckboat import _cache
+
+
+@pytest.fixture
+def no_count(monkeypatch):
+    """Fail if a row count would run a query."""
+    monkeypatch.setattr(uck.Table, 'do', lambda self, *xs: pytest.fail('counted rows'))
+
+
+@pytest.fixture
+def parquet_file(tmp_path):
+    path = tmp_path / 'x.parquet'
+    rel = uck.query('select range as x, range::varchar as s from range(10_000)')
+    rel.write_parquet(str(path), row_group_size=1_000)
+    return path
+
+
+def test_parquet_footer(parquet_file, no_count):
+    for src in [parquet_file, str(parquet_file)]:
+        t = uck.Table(src)
+        assert t.nrows() == 10_000
+        assert t.nbytes() > 0
+        assert t.rowcols() == "10000 x ['x', 's']"
+
+
+def test_empty_parquet(tmp_path, no_count):
+    path = tmp_path / 'empty.parquet'
+    uck.query('select 1 as x where false').write_parquet(str(path))
+    assert uck.Table(path).nrows() == 0
+
+
+def test_in_memory_source(no_count):
+    data = pa.table({'x': range(5)})
+    t = uck.Table(data)
+    assert t.nrows() == 5
+    assert t.nbytes() == data.nbytes
+
+    # converted to Arrow, so its size is known
+    t = uck.Table(pd.DataFrame({'x': range(5)}))
+    assert t.nrows() == 5
+    assert t.nbytes() == 40
+
+
+def test_pandas_source(no_count, monkeypatch):
+    monkeypatch.setattr(uck.options, 'pandas_to_arrow', False)
+    t = uck.Table(pd.DataFrame({'x': range(5)}))
+    assert t.nrows() == 5
+    assert t.nbytes() is None
+
+
+def test_cached_result(bump_calls):
+    t = uck.do(pd.DataFrame({'x': range(5)}), 'select bump(x) as x').cache()
+    try:
+        assert t.nrows() == 5
+        assert t.nbytes() == t.arrow().nbytes
+        assert len(bump_calls) == 5
+    finally:
+        t.uncache()
+
+
+def test_counted():
+    t = uck.Table(pd.DataFrame({'x': range(5)})).do('where x > 1')
+    assert t.nrows() == 3
+    assert t.nbytes() is None
+
+    # a cached table whose result has been evicted
+    t = t.cache()
+    _cache.clear()
+    assert t.nrows() == 3
+    t.uncache()
+
+
+def test_csv_source_is_counted(tmp_path):
+    path = tmp_path / 'x.csv'
+    uck.Table(pd.DataFrame({'x': range(5)})).save(str(path))
+    assert uck.Table(path).nrows() == 5
+
+
+def test_dtypes():
+    t = uck.query("select 1 as a, 'x' as b, [1.5] as c")
+    assert uck.Table(t).dtypes == {
+        'a': 'INTEGER',
+        'b': 'VARCHAR',
+        'c': 'DECIMAL(2,1)[]',
+    }
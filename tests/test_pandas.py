@@ -0,0 +1,97 @@
+import sys
+
+import duckboat as uck
+import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from duckboat.table import _from_pandas
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'x': [1, 2, 3],
+        's': ['a', None, 'c'],
+        't': pd.to_datetime(['2020-01-01', None, '2020-01-03']),
+    }, index=[10, 20, 30])
+
+
+def test_converted_once(df):
+    t = uck.Table(df)
+    assert isinstance(t._source, pa.Table)
+    assert t.columns == ['x', 's', 't']
+    assert t.dtypes == {'x': 'BIGINT', 's': 'VARCHAR', 't': 'TIMESTAMP'}
+    assert t.do('select sum(x)', int) == 6
+    assert uck.do({'a': df}, 'select sum(x) from a', int) == 6
+
+
+def test_same_result_as_pandas_scan(df, monkeypatch):
+    a = uck.do(df, 'select *', 'arrow')
+    monkeypatch.setattr(uck.options, 'pandas_to_arrow', False)
+    b = uck.do(df, 'select *', 'arrow')
+    assert a.equals(b)
+
+
+def test_left_to_duckdb():
+    # categoricals stay ENUMs, ordered by their categories
+    c = pd.Categorical(['lo', 'hi', 'lo'], categories=['lo', 'hi'])
+    df = pd.DataFrame({'c': c})
+    t = uck.Table(df)
+    assert t._source is df
+    assert t.dtypes == {'c': "ENUM('lo', 'hi')"}
+    assert t.do('select c order by c desc', list) == ['hi', 'lo', 'lo']
+
+    # columns of mixed types, which Arrow can't hold
+    df = pd.DataFrame({'m': [1, 'a']})
+    t = uck.Table(df)
+    assert t._source is df
+    assert t.aslist() == ['1', 'a']
+
+    # duplicate names, which DuckDB renames
+    df = pd.DataFrame([[1, 2]], columns=['a', 'a'])
+    t = uck.Table(df)
+    assert t._source is df
+    assert t.columns == ['a', 'a_1']
+
+    # dicts, which DuckDB reads as it does, not as Arrow structs
+    df = pd.DataFrame({'d': [{'a': 1}, {'b': 2}]})
+    t = uck.Table(df)
+    assert t._source is df
+    assert t.dtypes == {'d': 'MAP(VARCHAR, INTEGER)'}
+
+    # types Arrow can't hold
+    df = pd.DataFrame({'c': [1 + 2j]})
+    assert _from_pandas(df) is df
+    df = pd.DataFrame({'s': pd.arrays.SparseArray([1, 0])})
+    assert _from_pandas(df) is df
+
+    # half floats, which DuckDB reads from pandas but not from Arrow
+    df = pd.DataFrame({'h': np.array([1.5], dtype='float16')})
+    t = uck.Table(df)
+    assert t._source is df
+    assert t.dtypes == {'h': 'FLOAT'}
+    assert t.asitem() == 1.5
+
+    # pandas types, which Arrow holds as extension types DuckDB would
+    # read as their storage, not refuse
+    for col in pd.period_range('2024-01', periods=2, freq='M'), pd.interval_range(0, 2):
+        df = pd.DataFrame({'p': col})
+        assert _from_pandas(df) is df
+        with pytest.raises(duckdb.NotImplementedException):
+            uck.Table(df)
+
+
+def test_option_off(df, monkeypatch):
+    monkeypatch.setattr(uck.options, 'pandas_to_arrow', False)
+    t = uck.Table(df)
+    assert t._source is df
+    assert t.do('select sum(x)', int) == 6
+
+
+def test_without_pandas_imported(monkeypatch):
+    monkeypatch.delitem(sys.modules, 'pandas')
+    t = uck.Table(pa.table({'x': [1, 2]}))
+    assert t.do('select sum(x)', int) == 3
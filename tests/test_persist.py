@@ -0,0 +1,59 @@
+import gc
+
+import duckboat as uck
+import pandas as pd
+
+
+def _tables():
+    return uck.query("""
+        select database_name, table_name from duckdb_tables()
+        where table_name like '__duckboat_persist_%'
+    """).fetchall()
+
+
+def test_persist_fan_out(bump_calls):
+    t = uck.do(
+        pd.DataFrame({'x': range(3)}),
+        'select bump(x) as x',
+        'persist',
+    )
+    assert len(bump_calls) == 3
+
+    assert t.do('select sum(x)', int) == 6
+    assert t.do('select max(x)', int) == 3
+    assert t.do('as a cross join _ as b select count(*)', int) == 9
+    assert len(bump_calls) == 3
+
+
+def test_persist_disk(bump_calls):
+    t = uck.do(
+        pd.DataFrame({'x': range(3)}),
+        'select bump(x) as x',
+        'persist:disk',
+    )
+    assert ('__duckboat_disk__', t.rel.sql_query().split('.')[-1]) in _tables()
+    assert t.do('select sum(x)', int) == 6
+    assert len(bump_calls) == 3
+
+
+def test_persist_dropped():
+    before = len(_tables())
+
+    t = uck.Table(pd.DataFrame({'x': range(3)})).persist()
+    u = t.do('select x + 1 as x')
+    assert len(_tables()) == before + 1
+
+    del t
+    gc.collect()
+    assert u.do('select sum(x)', int) == 6
+
+    del u
+    gc.collect()
+    assert len(_tables()) == before
+
+
+def test_persist_batches():
+    """The stream keeps the persisted table alive until it's read."""
+    reader = uck.Table(pd.DataFrame({'x': range(3)})).do('persist', 'batches')
+    gc.collect()
+    assert reader.read_all()['x'].to_pylist() == [0, 1, 2]
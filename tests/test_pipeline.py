@@ -0,0 +1,142 @@
+import duckboat as uck
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({'x': range(10), 'g': ['a', 'b'] * 5})
+
+
+def test_pipeline(df):
+    p = uck.pipeline(df, 'where x > $lo', 'where g = $g', 'select count(*)', int)
+    assert p(lo=3, g='a') == 3
+    assert p(lo=0, g='b') == 5
+    assert p.sql.count('with _ as') == 2
+    assert repr(p).startswith('Pipeline(')
+
+
+def test_values_are_not_sql(df):
+    p = uck.pipeline(df, 'where g = $g', 'select count(*)', int)
+    assert p(g="a' or 1=1 --") == 0
+    assert p(g='a') == 5
+
+
+def test_lists(df):
+    p = uck.pipeline(df, 'where x in (select unnest($xs))', 'select sum(x)', int)
+    assert p(xs=[1, 2, 3]) == 6
+    assert p(xs=list(range(10_000))) == 45
+
+
+def test_result_is_a_table(df):
+    p = uck.pipeline(df, 'where x < $n')
+    t = p(n=2)
+    assert isinstance(t, uck.Table)
+    assert t.do('select x', list) == [0, 1]
+
+    # later steps in the chain, including ones after the first non-SQL step
+    p = uck.pipeline(df, 'where x < $n', 'arrow', uck.Table, 'select sum(x)', int)
+    assert p(n=4) == 6
+
+
+def test_named_tables(df):
+    other = pd.DataFrame({'g': ['a', 'b'], 'w': [10, 100]})
+    p = uck.pipeline(
+        {'t': df},
+        {'w': other},
+        'select sum(w) from t join w using (g) where x >= $lo',
+        int,
+    )
+    assert p(lo=8) == 110
+
+    p = uck.pipeline(df, {'w': other}, 'join w using (g)', 'select sum(w)', int)
+    assert p() == 550
+
+
+def test_sql_file(df, tmp_path):
+    path = tmp_path / 'q.sql'
+    path.write_text('where x = $x')
+    p = uck.pipeline(df, path, 'select g', str)
+    assert p(x=3) == 'b'
+
+
+def test_no_sql_steps(df):
+    assert uck.pipeline(df, 'select count(*)')().asitem() == 10
+    assert uck.pipeline(df)().nrows() == 10
+    assert uck.pipeline(uck.Table(df).do('where x < 3'))().nrows() == 3
+
+    with pytest.raises(ValueError, match='no table'):
+        uck.pipeline({'t': df})
+
+
+def test_missing_parameter(df):
+    p = uck.pipeline(df, 'where x > $lo and x < $hi')
+    assert p.params == {'lo', 'hi'}
+    with pytest.raises(TypeError, match='missing hi, lo'):
+        p()
+    with pytest.raises(TypeError, match='missing hi'):
+        p(lo=1, up=2)
+    with pytest.raises(TypeError, match='unexpected up'):
+        p(lo=1, hi=2, up=3)
+    with pytest.raises(ValueError, match=r'\$timeout is taken'):
+        uck.pipeline(df, 'where x > $timeout')
+
+
+def test_timeout(bump_calls):
+    p = uck.pipeline(
+        {},
+        'select sum(bump(range)) from range(100_000_000) where range > $lo',
+        int,
+    )
+    with pytest.raises(TimeoutError):
+        p(lo=0, timeout=0.1)
+
+
+@pytest.fixture
+def big():
+    """A query with parameters whose result, 400M rows, is too big to hold."""
+    t = pd.DataFrame({'x': range(20_000)})
+    p = uck.pipeline({'t': t}, 'select a.x, b.x as y from t a, t b where a.x > $n')
+    return p(n=1)
+
+
+def test_partial_reads(big):
+    assert big.columns == ['x', 'y']
+    assert big.dtypes == {'x': 'BIGINT', 'y': 'BIGINT'}
+    assert 'more not counted' in repr(big)
+    assert big.asdict(timeout=5).keys() == {'x', 'y'}
+    assert big.do('limit 3', 'select count(*)', int, timeout=5) == 3
+
+    with uck.ddb.time_limit(5):
+        batch = big.batches(1000).read_next_batch()
+    assert batch.num_rows == 1000
+
+    p = uck.pipeline(big, 'select x', int)
+    assert p(timeout=5) > 1
+
+    with pytest.raises(ValueError, match='2 columns and 2\\+ rows'):
+        big.aslist(timeout=5)
+
+    # used under a name, it's nested in the query rather than bound
+    sql = 'select count(*) from (from b limit 3)'
+    assert uck.do({'b': big}, sql, int, timeout=5) == 3
+    assert big.do(uck.rename('b'), sql, int, timeout=5) == 3
+    assert big._plan.rel is None  # never run in full
+
+
+def test_named_tables_with_parameters(df):
+    p = uck.pipeline({'t': df}, 'from t where x > $n')
+    a, b = p(n=7), p(n=5)
+
+    # both bind $n, so one is renamed
+    out = uck.do({'a': a, 'b': b}, 'select count(*) from a, b', int)
+    assert out == 2 * 4
+    assert a.do({'b': b}, ', b select count(*)', int) == 2 * 4
+    assert a._plan.rel is None and b._plan.rel is None
+
+
+def test_save(df, tmp_path):
+    p = uck.pipeline(df, 'where x > $n')
+    p(n=6).save(tmp_path / 'x.parquet')
+    t = uck.Table(tmp_path / 'x.parquet')
+    assert t.do('select x order by x', list) == [7, 8, 9]
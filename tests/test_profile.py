@@ -0,0 +1,65 @@
+import duckboat as uck
+import pandas as pd
+import pytest
+
+from duckboat import _profile
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({'x': range(100)})
+
+
+def test_profile(df):
+    with uck.profile() as p:
+        out = uck.do(df, 'where x >= 10', 'select sum(x)', int)
+
+    assert out == sum(range(10, 100))
+    assert [s.sql for s in p.steps] == [
+        'from _ where x >= 10',
+        'from _ select sum(x)',
+    ]
+    assert [s.rows for s in p.steps] == [90, 1]
+    for s in p.steps:
+        assert s.bind_time > 0
+        assert s.exec_time > 0
+        assert 'children' in s.plan
+
+    assert repr(p) == 'Profile(2 steps)'
+    assert repr(p.steps[1]).startswith('Step(rows=1, bind_time=')
+    assert _profile.current() is None
+
+
+def test_profile_table(df):
+    with uck.profile() as p:
+        uck.do(df, 'where x < 5')
+
+    t = p.table()
+    assert t.columns == ['step', 'sql', 'bind_time', 'exec_time', 'rows', 'plan']
+    assert t.do('select step, sql, rows', dict) == {
+        'step': 0,
+        'sql': 'from _ where x < 5',
+        'rows': 5,
+    }
+    assert t.do('select json_valid(plan)', bool)
+
+
+def test_profile_deferred(df):
+    uck.options.defer_binding = True
+    try:
+        with uck.profile() as p:
+            uck.do(df, 'where x >= 10', 'select sum(x)', int)
+    finally:
+        uck.options.defer_binding = False
+
+    # the chain is bound once, as a single query
+    [step] = p.steps
+    assert step.rows == 1
+    assert 'where x >= 10' in step.sql
+
+
+def test_nothing_recorded_outside(df):
+    with uck.profile() as p:
+        pass
+    uck.do(df, 'where x < 5')
+    assert p.steps == []
@@ -0,0 +1,212 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+
+import duckboat as uck
+import pytest
+import urllib.error
+
+from duckboat import _remote
+
+
+class _Server:
+    """
+    Serves `files`, a dict of path -> (body, headers), and records the
+    status of each response.
+    """
+    def __init__(self):
+        self.files = {}
+        self.log = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path not in server.files:
+                    return self._reply(404)
+                body, headers = server.files[self.path]
+                etag = headers.get('ETag')
+                modified = headers.get('Last-Modified')
+                if (
+                    (etag and self.headers.get('If-None-Match') == etag)
+                    or (modified and self.headers.get('If-Modified-Since') == modified)
+                ):
+                    return self._reply(304)
+                self._reply(200, body, headers)
+
+            def _reply(self, code, body=b'', headers={}):
+                server.log.append(code)
+                self.send_response(code)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                if 'Content-Length' not in headers:
+                    self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_port}'
+        threading.Thread(
+            target=self.httpd.serve_forever, args=(0.01,), daemon=True,
+        ).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    s = _Server()
+    yield s
+    s.stop()
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(uck.options, 'remote_cache', True)
+    monkeypatch.setattr(uck.options, 'remote_cache_dir', tmp_path / 'cache')
+    return tmp_path / 'cache'
+
+
+def _csv(n):
+    return ''.join(['a\n'] + [f'{i}\n' for i in range(n)]).encode()
+
+
+def test_etag_revalidation(server, cache):
+    server.files['/x.csv'] = (_csv(3), {'ETag': '"v1"'})
+    url = server.url + '/x.csv'
+
+    t = uck.Table(url)
+    repr(t)
+    assert t.do('select sum(a)', int) == 3
+    assert server.log == [200]
+
+    # unchanged: revalidated, not downloaded
+    assert uck.Table(url).nrows() == 3
+    assert server.log == [200, 304]
+
+    # changed
+    server.files['/x.csv'] = (_csv(5), {'ETag': '"v2"'})
+    assert uck.Table(url).nrows() == 5
+    assert server.log == [200, 304, 200]
+
+
+def test_last_modified_revalidation(server, cache):
+    date = 'Wed, 21 Oct 2015 07:28:00 GMT'
+    server.files['/x.csv'] = (_csv(3), {'Last-Modified': date})
+    url = server.url + '/x.csv'
+
+    assert uck.Table(url).nrows() == 3
+    assert uck.Table([url]).nrows() == 3
+    assert server.log == [200, 304]
+
+
+def test_no_validators(server, cache):
+    server.files['/x.csv'] = (_csv(3), {})
+    url = server.url + '/x.csv'
+
+    assert uck.Table(url).nrows() == 3
+    assert uck.Table(url).nrows() == 3
+    assert server.log == [200, 200]
+
+    # stored by content, once
+    assert len(list((cache / 'blobs').iterdir())) == 1
+
+
+def test_parquet_source(server, cache, tmp_path):
+    path = tmp_path / 'x.parquet'
+    uck.Table(uck.query('select range as x from range(10)')).save(path)
+    server.files['/data/x.parquet'] = (path.read_bytes(), {'ETag': '"p"'})
+
+    t = uck.Table(server.url + '/data/x.parquet')
+    assert str(t._source).endswith('.parquet')
+    assert t.nrows() == 10
+
+
+def test_eviction(server, cache, monkeypatch):
+    monkeypatch.setattr(uck.options, 'remote_cache_size', 50)
+    for i in range(3):
+        server.files[f'/{i}.csv'] = (_csv(10 + i), {})
+
+    for i in range(3):
+        assert uck.Table(f'{server.url}/{i}.csv').nrows() == 10 + i
+
+    # only the latest is kept, even though it alone is over the limit
+    blobs = list((cache / 'blobs').iterdir())
+    assert len(blobs) == 1
+    assert blobs[0].read_bytes() == _csv(12)
+
+    # an evicted file is downloaded again
+    assert uck.Table(f'{server.url}/0.csv').nrows() == 10
+    assert server.log == [200, 200, 200, 200]
+
+
+def test_eviction_spares_live_tables(server, cache, monkeypatch):
+    monkeypatch.setattr(uck.options, 'remote_cache_size', 50)
+    for i in range(3):
+        server.files[f'/{i}.csv'] = (_csv(10 + i), {})
+
+    t = uck.Table(f'{server.url}/0.csv').do('select sum(a)')
+    ts = uck.Table([f'{server.url}/1.csv', f'{server.url}/2.csv'])
+    assert t.asitem() == sum(range(10))
+    assert ts.nrows() == 23
+    assert len(list((cache / 'blobs').iterdir())) == 3
+
+    del t, ts
+    server.files['/3.csv'] = (_csv(13), {})
+    uck.Table(f'{server.url}/3.csv')
+    assert len(list((cache / 'blobs').iterdir())) == 1
+
+
+def test_offline(server, cache):
+    server.files['/x.csv'] = (_csv(3), {'ETag': '"v1"'})
+    url = server.url + '/x.csv'
+    uck.Table(url)
+
+    server.stop()
+    assert uck.Table(url).nrows() == 3
+
+    with pytest.raises(urllib.error.URLError):
+        uck.Table(server.url + '/y.csv')
+
+
+def test_errors(server, cache):
+    with pytest.raises(urllib.error.HTTPError, match='404'):
+        uck.Table(server.url + '/missing.csv')
+
+    # a truncated download leaves nothing behind
+    server.files['/x.csv'] = (_csv(3), {'Content-Length': '1000'})
+    with pytest.raises(ConnectionError, match='ended 992 bytes early'):
+        uck.Table(server.url + '/x.csv')
+    assert list((cache / 'blobs').iterdir()) == []
+
+
+def test_cache_off(server, tmp_path, monkeypatch):
+    # off unless asked for
+    monkeypatch.setattr(uck.options, 'remote_cache_dir', tmp_path / 'cache')
+    assert _remote.localize(server.url + '/x.csv') == server.url + '/x.csv'
+    assert not (tmp_path / 'cache').exists()
+
+
+def test_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv('DUCKBOAT_CACHE_DIR', str(tmp_path))
+    assert _remote.cache_dir() == tmp_path
+
+    monkeypatch.delenv('DUCKBOAT_CACHE_DIR')
+    assert _remote.cache_dir().parts[-2:] == ('.cache', 'duckboat')
+
+
+def test_remote_argument(server, tmp_path):
+    server.files['/x.csv'] = (_csv(3), {})
+    path = tmp_path / 'data' / 'x.csv'
+
+    t = uck.Table(path, remote=server.url + '/x.csv')
+    assert t.nrows() == 3
+    assert path.read_bytes() == _csv(3)
+
+    # the local file is used from then on
+    server.files['/x.csv'] = (_csv(5), {})
+    assert uck.Table(path, remote=server.url + '/x.csv').nrows() == 3
+    assert server.log == [200]
@@ -1,6 +1,7 @@
 import duckboat as uck
 import pandas as pd
 import numpy as np
+import pytest
 
 
 def dedent_helper(s):
@@ -52,3 +53,66 @@ def test_rowcols():
 
     t = uck.Table(df).hide()
     assert t.rowcols() == '<Table(..., _hide=True)>'
+
+
+@pytest.fixture
+def preview():
+    yield uck.options
+    uck.options.preview_rows = 20
+    uck.options.preview_sample = False
+    uck.options.preview_timeout = 0.5
+
+
+def test_preview(preview, bump_calls):
+    preview.preview_rows = 3
+    t = uck.do(pd.DataFrame({'x': range(1000)}), 'select bump(x) as x')
+
+    out = """
+    ┌───────┐
+    │   x   │
+    │ int64 │
+    ├───────┤
+    │     1 │
+    │     2 │
+    │     3 │
+    └───────┘
+    first 3 rows, more not counted
+    """
+    assert repr(t) == dedent_helper(out)
+    assert len(bump_calls) < 1000
+
+    # no footer when everything fits
+    assert repr(t.do('limit 3')) == repr(t.do('limit 3').rel)
+
+
+def test_preview_wide(preview):
+    preview.preview_rows = 2
+    cols = ', '.join(f'range as column_number_{i}' for i in range(30))
+    t = uck.Table(uck.query(f'select {cols} from range(10)'))
+
+    last = repr(t).splitlines()[-1]
+    assert last.startswith('  first 2 rows, more not counted  ')
+    assert last.endswith('30 columns (6 shown)')
+    assert len(last) <= len(repr(t).splitlines()[-2])
+
+
+def test_preview_sample(preview):
+    preview.preview_rows = 5
+    preview.preview_sample = True
+    t = uck.Table(uck.query('select range as x from range(1000)'))
+    assert repr(t).endswith('\n5 sampled rows, more not counted\n')
+
+
+def test_preview_timeout(preview):
+    preview.preview_timeout = 0.1
+    t = uck.Table(uck.query('select count(*) from range(10_000_000_000)'))
+    assert repr(t) == '<Table(..., preview timed out after 0.1s)>'
+
+    # the connection is still usable
+    assert uck.query('select 42').fetchone() == (42,)
+
+
+def test_preview_off(preview):
+    preview.preview_rows = None
+    t = uck.Table(uck.query('select range as x from range(100)'))
+    assert repr(t) == repr(t.rel)
@@ -0,0 +1,121 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import duckboat as uck
+import duckdb
+import pandas as pd
+import pytest
+
+from duckboat import ddb
+
+
+@pytest.fixture
+def pool_size():
+    yield ddb.set_pool_size
+    ddb.set_pool_size(None)
+
+
+def _cons_from_threads(n):
+    barrier = threading.Barrier(n)
+
+    def get(_):
+        barrier.wait()
+        return ddb.get_con()
+
+    with ThreadPoolExecutor(n) as ex:
+        return list(ex.map(get, range(n)))
+
+
+def test_main_thread_uses_root_connection():
+    assert ddb.get_con() is uck.con
+
+
+def test_each_thread_gets_a_connection():
+    cons = _cons_from_threads(4)
+    assert len({id(c) for c in cons}) == 4
+    assert uck.con not in cons
+
+
+def test_pool_size(pool_size):
+    pool_size(2)
+    cons = _cons_from_threads(4)
+    assert len({id(c) for c in cons}) == 2
+
+
+def test_concurrent_chains():
+    df = pd.DataFrame({'x': range(1000)})
+
+    def run(i):
+        return uck.do(df, f'where x < {i}', 'select count(*)', int)
+
+    with ThreadPoolExecutor(4) as ex:
+        out = list(ex.map(run, range(0, 1000, 100)))
+
+    assert out == list(range(0, 1000, 100))
+
+
+def test_table_from_another_thread():
+    t = uck.Table(pd.DataFrame({'x': [1, 2, 3]}))
+
+    with ThreadPoolExecutor(1) as ex:
+        out = ex.submit(t.do, 'select sum(x)', int).result()
+
+    assert out == 6
+
+
+def test_rebound_on_other_thread(tmp_path):
+    from duckboat.ddb._query import _rebound
+
+    path = tmp_path / 'x.parquet'
+    uck.Table(pd.DataFrame({'x': range(10)})).save(path)
+    t = uck.Table(str(path)).do('where x > 5')
+
+    def run():
+        out = t.do('select sum(x)', int), t.do('select count(*)', int)
+        # bound again from its query, once, rather than copied
+        return out, _rebound()[t.rel]
+
+    with ThreadPoolExecutor(1) as ex:
+        out, rebound = ex.submit(run).result()
+    assert out == (30, 4)
+    assert isinstance(rebound, duckdb.DuckDBPyRelation)
+
+
+def test_temp_table_from_another_thread():
+    t = uck.Table(pd.DataFrame({'x': [1, 2, 3]})).do('persist')
+
+    with ThreadPoolExecutor(1) as ex:
+        out = ex.submit(t.do, 'select sum(x)', int).result()
+        rows = ex.submit(t.aslist).result()
+
+    assert out == 6
+    assert rows == [1, 2, 3]
+
+
+def test_runs_on_this_thread():
+    t = uck.Table(pd.DataFrame({'x': [1, 2, 3]}))
+    assert ddb.owner(t.rel) is uck.con
+
+    def run():
+        rel = ddb.rebind(t.rel)
+        return ddb.owner(rel) is ddb.get_con(), rel.fetchall()
+
+    with ThreadPoolExecutor(1) as ex:
+        assert ex.submit(run).result() == (True, [(1,), (2,), (3,)])
+
+
+def test_other_invalid_input_still_raises():
+    with pytest.raises(duckdb.InvalidInputException):
+        uck.query('select * from x', x=object())
+
+
+def test_same_name_across_threads():
+    """Concurrent queries each see their own `t`."""
+    def run(i):
+        df = pd.DataFrame({'x': [i] * 100})
+        return uck.query('select sum(x) from t', t=df).fetchone()[0]
+
+    with ThreadPoolExecutor(8) as ex:
+        out = list(ex.map(run, range(64)))
+
+    assert out == [100 * i for i in range(64)]
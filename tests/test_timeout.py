@@ -0,0 +1,225 @@
+import threading
+import time
+
+import duckboat as uck
+import duckdb
+import pytest
+
+from duckboat import ddb
+from duckboat.ddb import _timeout, time_limit
+
+_SLOW = 'select count(*) from range(10_000_000_000) as r'
+
+
+@pytest.fixture
+def slow():
+    return uck.Table(uck.query(_SLOW))
+
+
+def test_time_limit():
+    with pytest.raises(TimeoutError, match='0.1s'):
+        with time_limit(0.1):
+            uck.query(_SLOW).fetchall()
+
+    with time_limit(5):
+        assert uck.query('select 42').fetchone() == (42,)
+
+    with time_limit(None):
+        assert uck.query('select 42').fetchone() == (42,)
+
+
+def test_other_interrupts_pass_through():
+    con = uck.con
+    threading.Timer(0.1, con.interrupt).start()
+    with pytest.raises(duckdb.InterruptException):
+        with time_limit(5):
+            con.sql(_SLOW).fetchall()
+
+
+def test_per_call_timeout(slow, tmp_path):
+    with pytest.raises(TimeoutError):
+        slow.do(int, timeout=0.1)
+    with pytest.raises(TimeoutError):
+        uck.do(slow, 'select 1 as x', int, timeout=0.1)
+    with pytest.raises(TimeoutError):
+        slow.arrow(timeout=0.1)
+    with pytest.raises(TimeoutError):
+        slow.df(timeout=0.1)
+    with pytest.raises(TimeoutError):
+        slow.aslist(timeout=0.1)
+    with pytest.raises(TimeoutError):
+        slow.asdict(timeout=0.1)
+    with pytest.raises(TimeoutError):
+        slow.persist(timeout=0.1)
+    with pytest.raises(TimeoutError):
+        slow.save(str(tmp_path / 'x.csv'), timeout=0.1)
+    with pytest.raises(TimeoutError):
+        slow.save(str(tmp_path / 'x.parquet'), timeout=0.1)
+
+    assert uck.do(uck.query('select 42'), int, timeout=5) == 42
+
+
+def test_global_timeout(slow):
+    uck.options.query_timeout = 0.1
+    try:
+        with pytest.raises(TimeoutError):
+            slow.do(int)
+        # a per-call timeout overrides it
+        assert uck.do(uck.query('select 42'), int, timeout=5) == 42
+    finally:
+        uck.options.query_timeout = None
+
+
+def test_cancel(slow):
+    with uck.cancel_scope() as scope:
+        threading.Timer(0.1, scope.cancel).start()
+        with pytest.raises(duckdb.InterruptException):
+            slow.do(int)
+
+    assert scope.cancelled
+    assert not scope.timed_out
+
+    # cancelling after the block has no effect
+    scope.cancel()
+    assert uck.query('select 42').fetchone() == (42,)
+
+
+def test_cancel_between_queries(slow):
+    """Queries started after cancel() are interrupted too."""
+    with pytest.raises(duckdb.InterruptException):
+        with uck.cancel_scope() as scope:
+            scope.cancel()
+            slow.do(int)
+
+
+def test_timeout_on_another_thread(slow):
+    """A scope that fired leaves other threads' queries alone."""
+    fired = threading.Event()
+    done = threading.Event()
+    errors = []
+
+    def run():
+        with time_limit(0.2):
+            with pytest.raises(duckdb.InterruptException):
+                slow.do(int)  # a table made on the main thread
+            fired.set()
+            try:
+                uck.query('select 1')
+            except duckdb.InterruptException as e:
+                errors.append(e)
+            done.wait(5)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    assert fired.wait(5)
+    for _ in range(5):
+        out = uck.query('select count(*) from range(300_000_000)').fetchone()
+        assert out == (300_000_000,)
+    done.set()
+    thread.join()
+
+    # but the block can't start another query
+    assert len(errors) == 1
+
+
+def test_timeout_with_shared_pool(slow):
+    """Threads sharing a cursor don't interrupt each other's queries."""
+    ddb.set_pool_size(1)
+    entered = threading.Event()
+    results = []
+
+    def a():
+        try:
+            with time_limit(0.3):
+                uck.query('select 1').fetchall()
+                entered.set()
+                time.sleep(1)
+            with pytest.raises(TimeoutError):
+                with time_limit(0.1):
+                    slow.do(int)
+            results.append('a')
+        finally:
+            entered.set()
+
+    def b():
+        entered.wait(5)
+        deadline = time.monotonic() + 1.5
+        while time.monotonic() < deadline:
+            uck.query('select count(*) from range(100_000_000)').fetchall()
+        results.append('b')
+
+    threads = [threading.Thread(target=a), threading.Thread(target=b)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        ddb.set_pool_size(None)
+
+    assert sorted(results) == ['a', 'b']
+
+
+def test_batches_timeout(slow):
+    with pytest.raises(TimeoutError):
+        slow.batches(timeout=0.1)
+    with pytest.raises(TimeoutError):
+        slow.do('batches:10', timeout=0.1)
+
+    with uck.cancel_scope() as scope:
+        threading.Timer(0.1, scope.cancel).start()
+        with pytest.raises(duckdb.InterruptException):
+            slow.batches()
+
+
+def test_nested_scopes(slow):
+    with pytest.raises(TimeoutError):
+        with uck.cancel_scope(timeout=0.1) as outer:
+            with uck.cancel_scope() as inner:
+                slow.do(int)
+
+    assert outer.timed_out
+    assert not inner.timed_out
+
+
+def test_progress():
+    uck.con.execute("""
+        create or replace table uck_progress as
+        select range as x from range(5_000_000)
+    """)
+    scope = uck.cancel_scope()
+    errors = []
+
+    def run():
+        try:
+            with scope:
+                uck.query("""
+                    select count(distinct x % 1000003), sum(hash(x))
+                    from uck_progress
+                """).fetchall()
+        except duckdb.InterruptException as e:
+            errors.append(e)
+
+    assert scope.progress() == -1
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while scope.progress() <= 0 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    progress = scope.progress()
+    scope.cancel()
+    thread.join()
+    uck.con.execute('drop table uck_progress')
+
+    assert 0 < progress < 100
+    assert len(errors) == 1
+
+
+def test_watchdog_drops_finished_scopes():
+    dog = _timeout._Watchdog()
+    for _ in range(200):
+        scope = uck.cancel_scope(timeout=3600)
+        with scope:
+            dog.schedule(3600, scope)
+    assert len(dog.heap) < 100
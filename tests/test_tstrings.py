@@ -2,6 +2,8 @@ import duckboat as uck
 import pandas as pd
 import pytest
 
+from duckboat._tstrings import _process_template
+
 
 def test_tstring_join():
     orders = pd.DataFrame({'id': [1, 2, 3], 'amount': [10, 20, 30]})
@@ -113,3 +115,92 @@ def test_tstring_bad_type():
     bad = object()
     with pytest.raises(TypeError, match='tabular object'):
         uck.do(t'select * from {bad}')
+
+
+def test_tstring_values_are_parameters():
+    df = pd.DataFrame({'x': range(10)})
+
+    a = uck.Table(df).do(t'where x > {1}')
+    b = uck.Table(df).do(t'where x > {5}')
+    assert a._plan.sql == b._plan.sql
+    assert '($_p0)' in a._plan.sql
+    assert a._plan.params == {'_p0': 1}
+    assert a.nrows() == 8
+    assert b.nrows() == 4
+
+
+def test_tstring_list():
+    df = pd.DataFrame({'x': range(10)})
+    ids = list(range(0, 100_000, 3))
+
+    t = uck.Table(df).do(t'where x in {ids}', 'select sum(x)')
+    assert len(t._plan.sql) < 100
+    assert t.asitem() == 0 + 3 + 6 + 9
+
+    out = uck.do(t'select {(1, 2)} as a, {None} as b', dict)
+    assert out == {'a': [1, 2], 'b': None}
+
+
+def test_tstring_parameters_compose():
+    df = pd.DataFrame({'x': range(10)})
+    lo, hi = 1, 8
+
+    t = uck.Table(df).do(t'where x > {lo}', t'where x < {hi}', 'select sum(x)')
+    assert t._plan.params == {'_p0': 1, '_p1': 8}
+    assert t.asitem() == sum(range(2, 8))
+    assert 'Filters: x>1 AND x<8' in t.explain()
+
+
+def test_tstring_parameters_in_pipeline():
+    df = pd.DataFrame({'x': range(10)})
+    lo = 5
+
+    p = uck.pipeline(
+        t'select * from {df} where x >= {lo}', 'where x < $hi', 'select count(*)', int,
+    )
+    assert p.params == {'hi'}
+    assert p(hi=7) == 2
+
+
+def test_tstring_names():
+    data = {'orders': pd.DataFrame({'x': range(10)})}
+    _t0 = pd.DataFrame({'x': [1]})
+
+    def make():
+        return uck.do(t'select * from {data["orders"]} where x in (from {_t0})')
+
+    # deterministic, and clear of the variable named _t0
+    assert make()._plan.sql == make()._plan.sql == (
+        'select * from _t1 where x in (from _t0)'
+    )
+    assert make().nrows() == 1
+
+    # the same object gets one name
+    sql, tables, _ = _process_template(
+        t'select * from {data["orders"]} union all select * from {data["orders"]}'
+    )
+    assert list(tables) == ['_t0']
+    assert sql.count('_t0') == 2
+
+
+def test_tstring_parameters_read_lazily():
+    t = pd.DataFrame({'x': range(20_000)})
+    n = 1
+
+    # 400M rows, which binding the query would compute in full
+    big = uck.do(t'select a.x, b.x as y from {t} a, {t} b where a.x > {n}')
+    assert 'more not counted' in repr(big)
+    assert big.asdict(timeout=5).keys() == {'x', 'y'}
+    assert big.do('limit 2', 'select count(*)', int, timeout=5) == 2
+
+    # interpolated as a table, it's nested in the query, its $_p0 renamed
+    m = 3
+    out = uck.do(t'select count(*) from (from {big} where y < {m} limit 5)', int)
+    assert out == 5
+    assert big._plan.rel is None
+
+
+def test_tstring_scalars_fit_literals():
+    n, day = 2, '2024-01-30'
+    out = uck.do(t'select date {day} + interval {n} day as d', str)
+    assert out == '2024-02-01 00:00:00'